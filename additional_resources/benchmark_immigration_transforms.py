@@ -0,0 +1,145 @@
+'''
+Micro-benchmark comparing the vectorized ImmigrationTransforms against the original row-wise staging steps, and the
+pandas engine against the pyarrow.compute engine.
+
+Usage:
+    python additional_resources/benchmark_immigration_transforms.py [--rows N] [--input path/to/i94_xxx_sub.parquet]
+
+When no input file is given a synthetic month with the same columns and value ranges as the raw i94 files is generated.
+The row-wise output, which stages the i94 codes as strings, is cast explicitly to the output schema of the transforms.
+Both the cast row-wise and the vectorized outputs are then written to parquet in memory and checked to be byte-identical,
+and the arrow engine output is checked to hold the same data as the pandas engine output.
+'''
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'airflow', 'plugins'))
+from helpers.immigration_transforms import ImmigrationTransforms
+
+
+def synthetic_month(rows, seed=0):
+    rng     = np.random.default_rng(seed)
+    arrdate = rng.integers(20454, 20485, rows).astype(float)
+    depdate = arrdate + rng.integers(0, 120, rows)
+    depdate[rng.random(rows) < 0.05] = np.nan
+    admnum  = rng.integers(1, rows * 2, rows).astype(float)
+    admnum[rng.random(rows) < 0.001] = 0
+    i94bir  = rng.integers(-2, 95, rows).astype(float)
+    i94bir[rng.random(rows) < 0.01] = np.nan
+    return pd.DataFrame({'i94yr'  : np.full(rows, 2016.0),
+                         'i94mon' : np.full(rows, 1.0),
+                         'i94cit' : rng.choice([101.0, 209.0, 582.0, np.nan], rows),
+                         'i94res' : rng.choice([101.0, 209.0, 582.0, np.nan], rows),
+                         'i94visa': rng.choice([1.0, 2.0, 3.0], rows),
+                         'i94mode': rng.choice([1.0, 2.0, 3.0, 9.0, np.nan], rows),
+                         'i94addr': rng.choice(['MA', 'NY', 'CA', None], rows),
+                         'i94bir' : i94bir,
+                         'gender' : rng.choice(['M', 'F', 'X', 'U', 'Z', None], rows),
+                         'arrdate': arrdate,
+                         'depdate': depdate,
+                         'admnum' : admnum})
+
+
+def row_wise_stage(data):
+    ''' Staging steps as originally implemented in StageImmigrationDataOperator.execute '''
+    data.i94yr = data.i94yr.astype(int)
+    data.i94mon = data.i94mon.astype(int)
+    data.i94cit = data.i94cit.astype(str)
+    data.i94res = data.i94res.astype(str)
+    data.i94visa = data.i94visa.astype(str)
+    data.i94mode = data.i94mode.astype(str)
+    data.i94bir = data.i94bir.astype(float)
+
+    data = data[data['admnum']!=0]
+    data = data[data.duplicated(subset=['admnum'])==False]
+    data.admnum = data.admnum.astype(int)
+    assert data.i94yr.nunique()==1
+    assert data.i94mon.nunique()==1
+
+    data.i94bir = data.i94bir.apply(lambda x: x if x>=0 else np.nan)
+    data.gender = data.gender.apply(lambda x: x if x in ['M', 'F', 'X', 'U'] else np.nan)
+
+    data.arrdate = pd.to_timedelta(data.arrdate, unit='D') + pd.Timestamp('1960-1-1')
+    data['arrival_day']   = data.arrdate.apply(lambda x: x.day)
+    data['arrival_month'] = data.arrdate.apply(lambda x: x.month)
+    data['arrival_year']  = data.arrdate.apply(lambda x: x.year)
+    assert (data['arrival_month'] != data['i94mon']).sum()==0
+    assert (data['arrival_year']  != data['i94yr']) .sum()==0
+
+    data.depdate = pd.to_timedelta(data.depdate, unit='D') + pd.Timestamp('1960-1-1')
+    data['departure_day']   = data.depdate.apply(lambda x: x.day)
+    data['departure_month'] = data.depdate.apply(lambda x: x.month)
+    data['departure_year']  = data.depdate.apply(lambda x: x.year)
+    data['length_of_stay'] = (data.depdate - data.arrdate).apply(lambda x: x.days)
+
+    for column in ['arrival_day', 'arrival_month', 'arrival_year',
+                   'departure_day', 'departure_month', 'departure_year',
+                   'length_of_stay']:
+        data[column] = data[column].fillna(-9999).astype(int)
+
+    return data[ImmigrationTransforms.output_columns]
+
+
+def as_output_schema(data):
+    ''' Row-wise output cast to ImmigrationTransforms.output_schema, parsing the code columns the original operator staged as strings such as "101.0" or "nan" '''
+    data = data.copy()
+    for column in ['i94cit', 'i94res', 'i94visa', 'i94mode']:
+        data[column] = data[column].astype(float).astype('Int16')
+    return pa.Table.from_pandas(data, schema=ImmigrationTransforms.output_schema, preserve_index=False)
+
+
+def to_parquet_bytes(table):
+    buffer = io.BytesIO()
+    pq.write_table(decoded(table), buffer)
+    return buffer.getvalue()
+
+
+def decoded(table):
+    ''' Table with dictionary-encoded columns cast back to their values, since both engines may order dictionaries differently '''
+    columns = [column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column for column in table.columns]
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+def timed(function, data):
+    start  = time.perf_counter()
+    output = function(data.copy())
+    return output, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows',  type=int, default=1_000_000)
+    parser.add_argument('--input', default=None)
+    args = parser.parse_args()
+
+    data = pd.read_parquet(args.input) if args.input else synthetic_month(args.rows)
+    print(f"Benchmarking {len(data):,} rows")
+
+    row_wise,   row_wise_time   = timed(row_wise_stage,             data)
+    vectorized, vectorized_time = timed(ImmigrationTransforms.stage, data)
+
+    print(f"Row-wise:   {row_wise_time:8.3f} s")
+    print(f"Vectorized: {vectorized_time:8.3f} s ({row_wise_time / vectorized_time:.1f}x)")
+
+    pandas_engine = pa.Table.from_pandas(vectorized, schema=ImmigrationTransforms.output_schema, preserve_index=False)
+    assert to_parquet_bytes(as_output_schema(row_wise)) == to_parquet_bytes(pandas_engine), 'Staged parquet outputs differ'
+    print("Staged parquet outputs are byte-identical")
+
+    table = pa.Table.from_pandas(data, preserve_index=False).select(ImmigrationTransforms.input_columns)
+    start = time.perf_counter()
+    arrow = ImmigrationTransforms.stage_arrow(table)
+    arrow_time = time.perf_counter() - start
+    print(f"Arrow:      {arrow_time:8.3f} s ({row_wise_time / arrow_time:.1f}x)")
+
+    assert decoded(arrow).equals(decoded(pandas_engine)), 'Arrow and pandas engine outputs differ'
+    print("Arrow and pandas engine outputs hold the same data")
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+import os
+from airflow import DAG
+from airflow.models import Variable
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.operators import BackfillImmigrationDataOperator
+
+
+####################################
+######## DAG CONFIGURATION #########
+####################################
+
+default_args = {'owner'          : 'ascfraguas',
+                'depends_on_past': False,
+                'retries'        : 1,
+                'retry_delay'    : timedelta(minutes=5),
+                'catchup'        : False,
+                'email_on_retry' : False}
+
+dag = DAG('immigration_staging_backfill',
+          description       = 'Stage a range of months of immigration data in a single pass, as a manually triggered backfill',
+          default_args      = default_args,
+          start_date        = datetime(2015, 12, 15),
+          schedule_interval = None,
+          max_active_runs   = 1)
+
+
+####################################
+########### DEFINE TASKS ###########
+####################################
+
+start_operator = DummyOperator(
+    task_id = 'Begin_execution',
+    dag     = dag)
+
+backfill_immigration_data = BackfillImmigrationDataOperator(
+    task_id             = 'Backfill_immigration_data',
+    dag                 = dag,
+    aws_credentials_id  = 'aws_credentials',
+    input_s3_bucket     = "ascfraguas-udacity-deng-capstone",
+    input_s3_key        = "raw/immigration-data",
+    output_s3_bucket    = 'ascfraguas-udacity-deng-capstone',
+    output_s3_key       = 'staging/immigration-data',
+    cluster_slices      = int(Variable.get('redshift_slices', default_var=4)),
+    parts_per_slice     = 1,
+    admnum_index_s3_key = 'staging/admnum-index',
+    redshift_conn_id    = 'redshift',
+    labels_path         = Variable.get('sas_labels_path',
+                                       default_var = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                                                                  'additional_resources', 'I94_SAS_Labels_Descriptions.SAS')),
+    start_month         = '2016-01',
+    end_month           = '2016-12',
+    max_workers         = 4)
+
+end_operator = DummyOperator(
+    task_id = 'Stop_execution',
+    dag     = dag)
+
+
+####################################
+######## TASK DEPENDENCIES #########
+####################################
+
+start_operator >> backfill_immigration_data >> end_operator
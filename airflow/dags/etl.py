@@ -3,14 +3,12 @@ import os
 from airflow import DAG
 from airflow.models import Variable
 from airflow.operators.dummy_operator import DummyOperator
-from helpers import SqlQueries, ImmigrationDimensions
+from helpers import SqlQueries
 from airflow.operators import (SchemaAndTableCreationOperator,
-                               StageImmigrationDimensionsOperator,
                                StageImmigrationDataOperator,
                                StageTemperatureDataOperator,
                                CopyDimensionsOperator,
                                CopyDataOperator,
-                               PostgresOperator,
                                RunQualityCheckOperator,
                                RunAnalysisOperator)
 
@@ -32,7 +30,22 @@ dag = DAG('immigration_and_temperature_reports_1',
           start_date        = datetime(2015, 12, 15),
           end_date          = datetime(2016, 12, 15),
           schedule_interval ='@monthly',
-          max_active_runs   = 1)
+          max_active_runs   = int(Variable.get('max_active_runs', default_var=4)))
+
+# Month-scoped tasks of different runs can execute concurrently, with their concurrency bounded by Airflow pools:
+#   - staging_pool: S3 staging of the monthly immigration data. The admnum index step of these tasks is serialized
+#     across runs by a lock on immigration.admnum_index_lock
+#   - redshift_pool: Month-scoped statements against Redshift (fact COPY, quality checks and analyses)
+#   - shared_tables_pool: Tasks rebuilding tables shared by every run (schema, dimensions and temperatures). This pool
+#     should be created with a single slot, so that these tasks never overlap across runs
+staging_pool       = 'staging_pool'
+
+# SAS labels file parsed into the immigration dimensions, which must be readable from every worker
+sas_labels_path    = Variable.get('sas_labels_path',
+                                  default_var = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                                                             'additional_resources', 'I94_SAS_Labels_Descriptions.SAS'))
+redshift_pool      = 'redshift_pool'
+shared_tables_pool = 'shared_tables_pool'
 
 
 ####################################
@@ -52,6 +65,7 @@ start_operator = DummyOperator(
 create_schemas_and_tables = SchemaAndTableCreationOperator(
     task_id            = 'Create_schemas_and_tables',  
     dag                = dag,
+    pool               = shared_tables_pool,
     redshift_conn_id   = 'redshift',
     create_schemas_sql = SqlQueries.create_schemas_query,
     create_tables_sql  = SqlQueries.create_tables_query,
@@ -60,35 +74,31 @@ create_schemas_and_tables = SchemaAndTableCreationOperator(
 
 #### -------> FILE STAGING
 
-stage_immigration_dimensions  = StageImmigrationDimensionsOperator(
-    task_id            = 'Stage_immigration_dimensions', 
-    dag                = dag,
-    aws_credentials_id = 'aws_credentials',
-    dimensions         = [{'table_name': 'country_codes'      , 'records': ImmigrationDimensions.country_codes      },
-                          {'table_name': 'port_codes'         , 'records': ImmigrationDimensions.port_codes         },
-                          {'table_name': 'entry_channel_codes', 'records': ImmigrationDimensions.entry_channel_codes},
-                          {'table_name': 'state_codes'        , 'records': ImmigrationDimensions.state_codes        },
-                          {'table_name': 'trip_reason_codes'  , 'records': ImmigrationDimensions.trip_reason_codes  }],
-    output_s3_bucket   = 'ascfraguas-udacity-deng-capstone',
-    output_s3_key      = 'staging/immigration-dimensions')
-
 stage_monthly_immigration_data  = StageImmigrationDataOperator(
-    task_id            = 'Stage_monthly_immigration_data',  
-    dag                = dag,
-    aws_credentials_id = 'aws_credentials',
-    input_s3_bucket    = "ascfraguas-udacity-deng-capstone",
-    input_s3_key       = "raw/immigration-data",
-    output_s3_bucket   = 'ascfraguas-udacity-deng-capstone',
-    output_s3_key      = 'staging/immigration-data')
+    task_id             = 'Stage_monthly_immigration_data',  
+    dag                 = dag,
+    pool                = staging_pool,
+    aws_credentials_id  = 'aws_credentials',
+    input_s3_bucket     = "ascfraguas-udacity-deng-capstone",
+    input_s3_key        = "raw/immigration-data",
+    output_s3_bucket    = 'ascfraguas-udacity-deng-capstone',
+    output_s3_key       = 'staging/immigration-data',
+    cluster_slices      = int(Variable.get('redshift_slices', default_var=4)),
+    parts_per_slice     = 1,
+    admnum_index_s3_key = 'staging/admnum-index',
+    redshift_conn_id    = 'redshift',
+    labels_path         = sas_labels_path)
 
 stage_temperatures_data  = StageTemperatureDataOperator(
     task_id            = 'Stage_temperatures_data',  
     dag                = dag,
+    pool               = shared_tables_pool,
     aws_credentials_id = 'aws_credentials',
     input_s3_bucket    = "ascfraguas-udacity-deng-capstone",
     input_s3_key       = "raw/temperatures-data",
     output_s3_bucket   = 'ascfraguas-udacity-deng-capstone',
-    output_s3_key      = 'staging/temperatures-data')
+    output_s3_key      = 'staging/temperatures-data',
+    staging_mode       = 'summary')
 
 
 #### -------> COPY TO REDSHIFT
@@ -96,41 +106,37 @@ stage_temperatures_data  = StageTemperatureDataOperator(
 copy_monthly_immigration_data  = CopyDataOperator(
     task_id            = 'Copy_monthly_immigration_data',  
     dag                = dag,
+    pool               = redshift_pool,
     redshift_conn_id   = 'redshift',
     iam_role           = Variable.get('iam_role'),
     immigration_data   = True,
-    copy_statement     = SqlQueries.copy_immigration_data,
+    load_mode          = 'merge',
     input_s3_bucket    = 'ascfraguas-udacity-deng-capstone',
-    input_s3_key       = 'staging/immigration-data')
-
-copy_temperatures_data  = CopyDataOperator(
-    task_id            = 'Copy_temperatures_data',  
-    dag                = dag,
-    redshift_conn_id   = 'redshift',
-    iam_role           = Variable.get('iam_role'),
-    immigration_data   = False,
-    copy_statement     = SqlQueries.copy_temperature_data,
-    input_s3_bucket    = 'ascfraguas-udacity-deng-capstone',
-    input_s3_key       = 'staging/temperatures-data')
+    input_s3_key       = 'staging/immigration-data',
+    manifest           = True)
+
+copy_temperatures_summary  = CopyDataOperator(
+    task_id             = 'Copy_temperatures_summary',  
+    dag                 = dag,
+    pool                = shared_tables_pool,
+    redshift_conn_id    = 'redshift',
+    iam_role            = Variable.get('iam_role'),
+    immigration_data    = False,
+    temperature_summary = True,
+    copy_statement      = SqlQueries.copy_temperature_stats,
+    input_s3_bucket     = 'ascfraguas-udacity-deng-capstone',
+    input_s3_key        = 'staging/temperatures-data')
 
 copy_immigration_dimensions  = CopyDimensionsOperator(
     task_id            = 'Copy_immigration_dimensions',  
     dag                = dag,
+    pool               = shared_tables_pool,
     redshift_conn_id   = 'redshift',
     iam_role           = Variable.get('iam_role'),
     dimensions         = ['country_codes', 'port_codes', 'entry_channel_codes', 'state_codes', 'trip_reason_codes'],
     truncate           = True,
-    input_s3_bucket    = 'ascfraguas-udacity-deng-capstone',
-    input_s3_key       = 'staging/immigration-dimensions')
-
-
-#### -------> RUN TEMPERATURES SUMMARY
-
-run_temperatures_sumary = PostgresOperator(
-    task_id          = "Run_temperatures_summary",
-    dag              = dag,
-    postgres_conn_id = "redshift",
-    sql              = SqlQueries.run_temps_summary)
+    load_mode          = 'insert',
+    labels_path        = sas_labels_path)
 
 
 #### -------> RUN DATA QUALITY CHECKS
@@ -138,10 +144,11 @@ run_temperatures_sumary = PostgresOperator(
 run_table_quality_checks = RunQualityCheckOperator(
     task_id          = 'Run_data_quality_checks',
     dag              = dag,
+    pool             = redshift_pool,
     redshift_conn_id = 'redshift',
     test_tables      = {'immigration.us_entries',            'immigration.country_codes', 'immigration.port_codes',
                         'immigration.entry_channel_codes',   'immigration.state_codes',   'immigration.trip_reason_codes',
-                        'temperature.full_temperature_data', 'temperature.temp_summary'},
+                        'temperature.temp_stats',            'temperature.temp_summary'},
     dq_checks        = [{'check_sql'        : "SELECT COUNT(*) FROM {}", 
                          'success_condition': "{}>0"}])
 
@@ -151,24 +158,28 @@ run_table_quality_checks = RunQualityCheckOperator(
 run_analysis_1  = RunAnalysisOperator(
     task_id          = 'Analyze_demographics_by_channel',  
     dag              = dag,
+    pool             = redshift_pool,
     redshift_conn_id = 'redshift',
     sql_statement    = SqlQueries.demographics_by_channel)
 
 run_analysis_2  = RunAnalysisOperator(
     task_id          = 'Analyze_length_of_stay',  
     dag              = dag,
+    pool             = redshift_pool,
     redshift_conn_id = 'redshift',
     sql_statement    = SqlQueries.length_of_stay)
 
 run_analysis_3  = RunAnalysisOperator(
     task_id          = 'Analyze_state_trip_reasons',  
     dag              = dag,
+    pool             = redshift_pool,
     redshift_conn_id = 'redshift',
     sql_statement    = SqlQueries.state_trip_reasons)
 
 run_analysis_4  = RunAnalysisOperator(
     task_id          = 'Analyze_freqs_and_mean_temps',  
     dag              = dag,
+    pool             = redshift_pool,
     redshift_conn_id = 'redshift',
     sql_statement    = SqlQueries.freqs_and_mean_temps)
 
@@ -185,13 +196,12 @@ end_operator = DummyOperator(
 ####################################
 
 start_operator                 >> create_schemas_and_tables
-create_schemas_and_tables      >> [stage_monthly_immigration_data, stage_immigration_dimensions, stage_temperatures_data]
+create_schemas_and_tables      >> [stage_monthly_immigration_data, copy_immigration_dimensions, stage_temperatures_data]
 stage_monthly_immigration_data >> copy_monthly_immigration_data
-stage_immigration_dimensions   >> copy_immigration_dimensions
-stage_temperatures_data        >> copy_temperatures_data >> run_temperatures_sumary
+stage_temperatures_data        >> copy_temperatures_summary
 [copy_monthly_immigration_data, 
  copy_immigration_dimensions, 
- run_temperatures_sumary]      >> run_table_quality_checks
+ copy_temperatures_summary]    >> run_table_quality_checks
 run_table_quality_checks       >> [run_analysis_1, 
                                    run_analysis_2, 
                                    run_analysis_3, 
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.models import Variable
+from airflow.operators.dummy_operator import DummyOperator
+from helpers import SqlQueries
+from airflow.operators import (SchemaAndTableCreationOperator,
+                               StageTemperatureDataOperator,
+                               CopyDataOperator,
+                               PostgresOperator,
+                               RunQualityCheckOperator)
+
+
+####################################
+######## DAG CONFIGURATION #########
+####################################
+
+default_args = {'owner'          : 'ascfraguas',
+                'depends_on_past': False,
+                'retries'        : 3,
+                'retry_delay'    : timedelta(minutes=5),
+                'catchup'        : False,
+                'email_on_retry' : False}
+
+dag = DAG('temperature_history_load',
+          description       = 'Load the full cleaned temperature series into Redshift, which the monthly reports do not need',
+          default_args      = default_args,
+          start_date        = datetime(2015, 12, 15),
+          schedule_interval = '@yearly',
+          catchup           = False,
+          max_active_runs   = 1)
+
+# Shares the single-slot pool of the reports DAG, since both rebuild the temperature tables
+shared_tables_pool = 'shared_tables_pool'
+
+
+####################################
+########### DEFINE TASKS ###########
+####################################
+
+start_operator = DummyOperator(
+    task_id = 'Begin_execution',
+    dag     = dag)
+
+create_schemas_and_tables = SchemaAndTableCreationOperator(
+    task_id            = 'Create_schemas_and_tables',
+    dag                = dag,
+    pool               = shared_tables_pool,
+    redshift_conn_id   = 'redshift',
+    create_schemas_sql = SqlQueries.create_schemas_query,
+    create_tables_sql  = SqlQueries.create_tables_query)
+
+stage_temperatures_data  = StageTemperatureDataOperator(
+    task_id            = 'Stage_temperatures_data',
+    dag                = dag,
+    pool               = shared_tables_pool,
+    aws_credentials_id = 'aws_credentials',
+    input_s3_bucket    = "ascfraguas-udacity-deng-capstone",
+    input_s3_key       = "raw/temperatures-data",
+    output_s3_bucket   = 'ascfraguas-udacity-deng-capstone',
+    output_s3_key      = 'staging/temperatures-data',
+    staging_mode       = 'clean',
+    redshift_conn_id   = 'redshift')
+
+copy_temperatures_data  = CopyDataOperator(
+    task_id            = 'Copy_temperatures_data',
+    dag                = dag,
+    pool               = shared_tables_pool,
+    redshift_conn_id   = 'redshift',
+    iam_role           = Variable.get('iam_role'),
+    immigration_data   = False,
+    load_mode          = 'incremental',
+    staging_task_id    = 'Stage_temperatures_data',
+    input_s3_bucket    = 'ascfraguas-udacity-deng-capstone',
+    input_s3_key       = 'staging/temperatures-data')
+
+run_temperatures_sumary = PostgresOperator(
+    task_id          = "Run_temperatures_summary",
+    dag              = dag,
+    pool             = shared_tables_pool,
+    postgres_conn_id = "redshift",
+    sql              = SqlQueries.run_temps_summary)
+
+run_table_quality_checks = RunQualityCheckOperator(
+    task_id          = 'Run_data_quality_checks',
+    dag              = dag,
+    redshift_conn_id = 'redshift',
+    test_tables      = {'temperature.full_temperature_data', 'temperature.load_watermarks',
+                        'temperature.temp_stats',            'temperature.temp_summary'},
+    dq_checks        = [{'check_sql'        : "SELECT COUNT(*) FROM {}",
+                         'success_condition': "{}>0"}])
+
+end_operator = DummyOperator(
+    task_id = 'Stop_execution',
+    dag     = dag)
+
+
+####################################
+######## TASK DEPENDENCIES #########
+####################################
+
+start_operator >> create_schemas_and_tables >> stage_temperatures_data >> copy_temperatures_data
+copy_temperatures_data >> run_temperatures_sumary >> run_table_quality_checks >> end_operator
@@ -12,6 +12,7 @@ class UdacityPlugin(AirflowPlugin):
         operators.SchemaAndTableCreationOperator,
         operators.StageImmigrationDimensionsOperator,
         operators.StageImmigrationDataOperator,
+        operators.BackfillImmigrationDataOperator,
         operators.StageTemperatureDataOperator,
         operators.CopyDataOperator,
         operators.CopyDimensionsOperator,
@@ -20,5 +21,14 @@ class UdacityPlugin(AirflowPlugin):
     ]
     helpers = [
         helpers.SqlQueries,
-        helpers.ImmigrationDimensions
+        helpers.SasLabels,
+        helpers.TransformSpec,
+        helpers.ImmigrationTransforms,
+        helpers.DimensionLookup,
+        helpers.TemperatureTransforms,
+        helpers.StagedParts,
+        helpers.SpooledS3Upload,
+        helpers.AdmnumIndex,
+        helpers.StagingCache,
+        helpers.RedshiftSession
     ]
@@ -1,7 +1,25 @@
 from helpers.sql_queries import SqlQueries
-from helpers.immigration_dimensions import ImmigrationDimensions
+from helpers.sas_labels import SasLabels
+from helpers.transform_spec import TransformSpec
+from helpers.immigration_transforms import ImmigrationTransforms
+from helpers.dimension_lookup import DimensionLookup
+from helpers.temperature_transforms import TemperatureTransforms
+from helpers.staged_parts import StagedParts
+from helpers.s3_upload import SpooledS3Upload
+from helpers.admnum_index import AdmnumIndex
+from helpers.staging_cache import StagingCache
+from helpers.redshift_session import RedshiftSession
 
 __all__ = [
     'SqlQueries',
-    'ImmigrationDimensions'
+    'SasLabels',
+    'TransformSpec',
+    'ImmigrationTransforms',
+    'DimensionLookup',
+    'TemperatureTransforms',
+    'StagedParts',
+    'SpooledS3Upload',
+    'AdmnumIndex',
+    'StagingCache',
+    'RedshiftSession'
 ]
\ No newline at end of file
@@ -0,0 +1,153 @@
+import io
+import numpy as np
+
+
+class AdmnumIndex:
+
+    '''
+    Persistent index of the admnum values already loaded into immigration.us_entries, used to drop entries staged in a
+    previous month before they are copied again. Each month is stored in S3 as a sorted array of unique int64 values
+    ({key_prefix}/{year}-{month}.npy) along with a Bloom filter of those values ({key_prefix}/{year}-{month}.bloom).
+    Months are queried one at a time, either by searching the sorted array or by checking the Bloom filter first and
+    downloading the sorted array only to confirm its hits, so that each month is read at most once and memory holds a
+    single month plus fixed-size chunks of the Bloom filter positions.
+
+    - Inputs:
+        * s3_hook: S3Hook used to read and write the index
+        * bucket_name: Bucket holding the index
+        * key_prefix: Path to the index within the bucket
+        * use_bloom: If True, membership is checked with the Bloom filter of each month plus an exact fallback on its hits
+        * bloom_bits_per_key: Size of the Bloom filters written, which sets their false positive rate (about 0.05% for
+          16 bits per key)
+        * chunk_size: Number of admnums whose Bloom filter positions are computed at once
+
+    - Outputs: Boolean masks flagging the admnums already loaded, and per month index files in S3
+    '''
+
+    bloom_hashes = 11
+
+    def __init__(self, s3_hook, bucket_name, key_prefix, use_bloom=True, bloom_bits_per_key=16, chunk_size=262144):
+        self.s3_hook            = s3_hook
+        self.bucket_name        = bucket_name
+        self.key_prefix         = key_prefix
+        self.use_bloom          = use_bloom
+        self.bloom_bits_per_key = bloom_bits_per_key
+        self.chunk_size         = chunk_size
+
+    @staticmethod
+    def month_name(year, month):
+        return f"{int(year):04d}-{int(month):02d}"
+
+    def month_key(self, month_name):
+        return f"{self.key_prefix}/{month_name}.npy"
+
+    def bloom_key(self, month_name):
+        return f"{self.key_prefix}/{month_name}.bloom"
+
+    def months(self):
+        keys = self.s3_hook.list_keys(bucket_name=self.bucket_name, prefix=f"{self.key_prefix}/") or []
+        return sorted(key[len(self.key_prefix) + 1:-len('.npy')] for key in keys if key.endswith('.npy'))
+
+    def load_array(self, key):
+        body = self.s3_hook.get_key(key, bucket_name=self.bucket_name).get()['Body'].read()
+        return np.load(io.BytesIO(body), allow_pickle=False)
+
+    def save_array(self, key, array):
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        buffer.seek(0)
+        self.s3_hook.load_file_obj(buffer,
+                                   key         = key,
+                                   bucket_name = self.bucket_name,
+                                   replace     = True)
+
+    def load_month(self, month_name):
+        return self.load_array(self.month_key(month_name))
+
+    def load_bloom(self, month_name):
+        ''' Bloom filter of a month, or None for months indexed before filters were stored '''
+        if not self.s3_hook.check_for_key(self.bloom_key(month_name), bucket_name=self.bucket_name):
+            return None
+        return self.load_array(self.bloom_key(month_name))
+
+    def save_month(self, month_name, admnums):
+        admnums = np.unique(np.asarray(admnums, dtype=np.int64))
+        self.save_array(self.bloom_key(month_name), self.bloom_filter(admnums))
+        self.save_array(self.month_key(month_name), admnums)
+
+    @staticmethod
+    def bloom_positions(admnums, bits):
+        ''' Bit positions of every key for each of the Bloom filter hashes, using double hashing over a splitmix64 mix '''
+        with np.errstate(over='ignore'):
+            mixed = np.asarray(admnums, dtype=np.int64).astype(np.uint64)
+            mixed = (mixed ^ (mixed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            mixed = (mixed ^ (mixed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            mixed =  mixed ^ (mixed >> np.uint64(31))
+            first  = mixed & np.uint64(0xFFFFFFFF)
+            second = (mixed >> np.uint64(32)) | np.uint64(1)
+            return [(first + np.uint64(index) * second) % np.uint64(bits) for index in range(AdmnumIndex.bloom_hashes)]
+
+    def bloom_filter(self, admnums):
+        ''' Bloom filter of the admnums as a packed uint8 array, whose positions are added chunk_size keys at a time '''
+        bloom = np.zeros(max(8, -(-len(admnums) * self.bloom_bits_per_key // 8)), dtype=np.uint8)
+        bits  = len(bloom) * 8
+        for start in range(0, len(admnums), self.chunk_size):
+            for positions in AdmnumIndex.bloom_positions(admnums[start:start + self.chunk_size], bits):
+                np.bitwise_or.at(bloom, (positions >> np.uint64(3)).astype(np.int64),
+                                 np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8)))
+        return bloom
+
+    def bloom_hits(self, bloom, admnums):
+        ''' Boolean mask of the admnums possibly present in the Bloom filter, checked chunk_size keys at a time '''
+        bits = len(bloom) * 8
+        hits = np.ones(len(admnums), dtype=bool)
+        for start in range(0, len(admnums), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            for positions in AdmnumIndex.bloom_positions(admnums[chunk], bits):
+                stored_bits  = bloom[(positions >> np.uint64(3)).astype(np.int64)]
+                hits[chunk] &= np.right_shift(stored_bits, (positions & np.uint64(7)).astype(np.uint8)) & 1 == 1
+        return hits
+
+    @staticmethod
+    def found_in(known, admnums):
+        ''' Boolean mask of the admnums present in a sorted array '''
+        if not len(known) or not len(admnums):
+            return np.zeros(len(admnums), dtype=bool)
+        positions = np.minimum(np.searchsorted(known, admnums), len(known) - 1)
+        return known[positions]==admnums
+
+    def loaded_mask(self, admnums, exclude_month=None):
+        '''
+        Boolean mask flagging the admnums already present in the index, ignoring exclude_month so that a month can be
+        staged again without dropping its own records.
+        '''
+        admnums = np.asarray(admnums, dtype=np.int64)
+        loaded  = np.zeros(len(admnums), dtype=bool)
+        for month in self.months():
+            if month==exclude_month:
+                continue
+            rows = np.flatnonzero(~loaded)
+            if not len(rows):
+                break
+
+            bloom = self.load_bloom(month) if self.use_bloom else None
+            if bloom is not None:
+                rows = rows[self.bloom_hits(bloom, admnums[rows])]
+                if not len(rows):
+                    continue
+            loaded[rows[AdmnumIndex.found_in(self.load_month(month), admnums[rows])]] = True
+        return loaded
+
+    def rebuild_from_redshift(self, redshift):
+        '''
+        Rebuilds the index of every month from the admnums currently loaded in immigration.us_entries, replacing the
+        stored months. Months no longer present in the warehouse are left untouched.
+        '''
+        months = redshift.get_records("SELECT DISTINCT arrival_year, arrival_month FROM immigration.us_entries "
+                                      "WHERE arrival_year>0 AND arrival_month>0")
+        for year, month in months:
+            admnums = redshift.get_records("SELECT admnum FROM immigration.us_entries "
+                                           f"WHERE arrival_year={int(year)} AND arrival_month={int(month)}")
+            self.save_month(AdmnumIndex.month_name(year, month),
+                            np.fromiter((admnum for admnum, in admnums), dtype=np.int64, count=len(admnums)))
+        return [AdmnumIndex.month_name(year, month) for year, month in months]
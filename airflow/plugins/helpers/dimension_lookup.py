@@ -0,0 +1,63 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class DimensionLookup:
+
+    '''
+    Code to name mapping of a dimension compiled for vectorized decoding. Integer codes are resolved through a dense
+    array indexed by the code itself, and string codes through a sorted array of codes searched with np.searchsorted,
+    so whole columns are decoded with a few numpy operations. String columns are dictionary-encoded first, so that only
+    their distinct values are searched.
+
+    - Inputs:
+        * records: Dict mapping each code of the dimension to its name, as parsed by SasLabels
+
+    - Outputs: Dictionary-encoded pyarrow arrays with the name of each code, null for null or unknown codes
+    '''
+
+    def __init__(self, records):
+        codes           = list(records)
+        names           = list(dict.fromkeys(records.values()))
+        name_positions  = {name: position for position, name in enumerate(names)}
+        code_positions  = np.array([name_positions[records[code]] for code in codes], dtype=np.int32)
+        self.dictionary = pa.array(names, type=pa.string())
+        self.integer    = len(codes)>0 and all(isinstance(code, (int, np.integer)) and code>=0 for code in codes)
+        if self.integer:
+            keys       = np.array(codes, dtype=np.int64)
+            self.dense = np.full(keys.max() + 1 if len(keys) else 0, -1, dtype=np.int32)
+            self.dense[keys] = code_positions
+        else:
+            keys        = np.array([str(code) for code in codes])
+            order       = np.argsort(keys, kind='stable')
+            self.keys   = keys[order]
+            self.order  = code_positions[order]
+
+    def positions(self, values):
+        ''' Position in the dictionary of each code of a numpy array without nulls, -1 for unknown codes '''
+        if self.integer:
+            values = values.astype(np.int64)
+            known  = (values >= 0) & (values < len(self.dense))
+            found  = np.full(len(values), -1, dtype=np.int32)
+            found[known] = self.dense[values[known]]
+            return found
+        if not len(self.keys):
+            return np.full(len(values), -1, dtype=np.int32)
+        values = values.astype(str)
+        index  = np.minimum(np.searchsorted(self.keys, values), len(self.keys) - 1)
+        return np.where(self.keys[index]==values, self.order[index], -1).astype(np.int32)
+
+    def decode(self, column):
+        column = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+        if not self.integer and not pa.types.is_dictionary(column.type):
+            column = pc.dictionary_encode(column)
+        if pa.types.is_dictionary(column.type):
+            value_positions = self.positions(column.dictionary.to_numpy(zero_copy_only=False))
+            indices         = column.indices.fill_null(0).to_numpy(zero_copy_only=False)
+            found           = value_positions[indices] if len(value_positions) else np.full(len(column), -1, dtype=np.int32)
+        else:
+            found           = self.positions(pc.fill_null(column, 0).to_numpy(zero_copy_only=False))
+        missing = (found < 0) | column.is_null().to_numpy(zero_copy_only=False)
+        return pa.DictionaryArray.from_arrays(pa.array(np.where(missing, 0, found), type=pa.int32(), mask=missing),
+                                              self.dictionary)
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from helpers.transform_spec import TransformSpec
+
+
+class ImmigrationTransforms:
+
+    '''
+    Preprocessing applied to the monthly i94 data before it is staged. The casts, validity rules, derived date columns
+    and projection are declared in spec, which is compiled once into a vectorized plan shared by the pandas and the
+    pyarrow.compute engines, so schema and rule changes only need an edit of the spec.
+
+    - Inputs: pandas DataFrame or pyarrow Table with the raw columns of the i94 parquet files
+
+    - Outputs: DataFrame or Table with the columns and types expected by the immigration.us_entries table. Country, visa
+               and mode codes are staged as nullable small integers, and gender and state codes as dictionary-encoded strings
+    '''
+
+    sas_epoch = pd.Timestamp('1960-1-1')
+
+    na_value = -9999
+
+    valid_genders = ['M', 'F', 'X', 'U']
+
+    output_schema = pa.schema([('admnum',          pa.int64()),
+                               ('i94bir',          pa.float64()),
+                               ('gender',          pa.dictionary(pa.int32(), pa.string())),
+                               ('i94visa',         pa.int16()),
+                               ('i94cit',          pa.int16()),
+                               ('i94res',          pa.int16()),
+                               ('i94addr',         pa.dictionary(pa.int32(), pa.string())),
+                               ('i94mode',         pa.int16()),
+                               ('arrival_day',     pa.int64()),
+                               ('arrival_month',   pa.int64()),
+                               ('arrival_year',    pa.int64()),
+                               ('departure_day',   pa.int64()),
+                               ('departure_month', pa.int64()),
+                               ('departure_year',  pa.int64()),
+                               ('length_of_stay',  pa.int64())])
+
+    spec = TransformSpec(schema      = output_schema,
+                         key         = 'admnum',
+                         drop_keys   = [0],
+                         constraints = {'i94bir'         : ('>=', 0),
+                                        'gender'         : ('isin', valid_genders)},
+                         derived     = {'arrival_day'    : ('day',   'arrdate'),
+                                        'arrival_month'  : ('month', 'arrdate'),
+                                        'arrival_year'   : ('year',  'arrdate'),
+                                        'departure_day'  : ('day',   'depdate'),
+                                        'departure_month': ('month', 'depdate'),
+                                        'departure_year' : ('year',  'depdate'),
+                                        'length_of_stay' : ('days_between', 'arrdate', 'depdate')},
+                         checks      = [('constant', 'i94yr'),
+                                        ('constant', 'i94mon'),
+                                        ('equal', 'arrival_month', 'i94mon'),
+                                        ('equal', 'arrival_year',  'i94yr')],
+                         date_epoch  = sas_epoch,
+                         na_value    = na_value)
+
+    plan = spec.compile()
+
+    dimension_columns = {'i94cit' : ('citizenship_country', 'country_codes'),
+                         'i94res' : ('residence_country',   'country_codes'),
+                         'i94addr': ('state',               'state_codes'),
+                         'i94mode': ('entry_channel',       'entry_channel_codes'),
+                         'i94visa': ('trip_reason',         'trip_reason_codes')}
+
+    denormalized_schema = output_schema.append(pa.field('citizenship_country', pa.dictionary(pa.int32(), pa.string()))) \
+                                       .append(pa.field('residence_country',   pa.dictionary(pa.int32(), pa.string()))) \
+                                       .append(pa.field('state',               pa.dictionary(pa.int32(), pa.string()))) \
+                                       .append(pa.field('entry_channel',       pa.dictionary(pa.int32(), pa.string()))) \
+                                       .append(pa.field('trip_reason',         pa.dictionary(pa.int32(), pa.string())))
+
+    input_columns  = plan.input_columns
+
+    input_filters  = plan.input_filters
+
+    output_columns = plan.output_columns
+
+    @staticmethod
+    def valid_row_groups(parquet_file):
+        '''
+        Indices of the row groups of a pyarrow ParquetFile that may hold valid admnum records. Row groups whose
+        statistics show only null or zero admnum values are skipped without being downloaded or decoded.
+        '''
+        metadata  = parquet_file.metadata
+        column    = metadata.schema.names.index('admnum')
+        selected  = []
+        for index in range(metadata.num_row_groups):
+            row_group  = metadata.row_group(index)
+            statistics = row_group.column(column).statistics
+            if statistics is not None and statistics.has_null_count and statistics.null_count==row_group.num_rows:
+                continue
+            if statistics is not None and statistics.has_min_max and statistics.min==0 and statistics.max==0:
+                continue
+            selected.append(index)
+        return selected
+
+    @staticmethod
+    def stage(data, seen_admnums=None):
+        ''' Applies the compiled plan to a pandas DataFrame, returning a DataFrame with output_columns '''
+        return ImmigrationTransforms.plan.to_pandas(data, seen_admnums)
+
+    @staticmethod
+    def stage_arrow(table, seen_admnums=None):
+        '''
+        Applies the compiled plan to a pyarrow Table with pyarrow.compute, producing a Table with output_schema without
+        ever converting the data to pandas. When seen_admnums is given the table is treated as one batch of a stream, so
+        those admnums are dropped as well and a batch left empty is returned as an empty table.
+        '''
+        return ImmigrationTransforms.plan.to_arrow(table, seen_admnums)
+
+    @staticmethod
+    def denormalize(table, lookups):
+        '''
+        Appends to a staged table the name of each coded column listed in dimension_columns, decoded with the
+        DimensionLookup of its dimension found in lookups, producing a table with denormalized_schema
+        '''
+        table   = table.cast(ImmigrationTransforms.output_schema)
+        columns = list(table.columns)
+        for code_column, (name_column, dimension) in ImmigrationTransforms.dimension_columns.items():
+            columns.append(lookups[dimension].decode(table[code_column]))
+        return pa.Table.from_arrays(columns, schema=ImmigrationTransforms.denormalized_schema)
+
+    @staticmethod
+    def stage_batches(batches, engine='pandas'):
+        '''
+        Streaming counterpart of stage() and stage_arrow(), applied batch by batch over an iterable of pyarrow RecordBatches.
+        The admnum values already staged are kept as a sorted int64 array, so de-duplication holds across batch
+        boundaries and the first occurrence of each admnum is kept, exactly as in the in-memory path.
+        '''
+        seen_admnums = np.empty(0, dtype=np.int64)
+        data_level   = None
+
+        for batch in batches:
+            if engine=='arrow':
+                staged = ImmigrationTransforms.stage_arrow(pa.Table.from_batches([batch]), seen_admnums)
+            else:
+                staged = pa.Table.from_pandas(ImmigrationTransforms.stage(batch.to_pandas(), seen_admnums),
+                                              schema         = ImmigrationTransforms.output_schema,
+                                              preserve_index = False)
+            if staged.num_rows==0:
+                continue
+
+            batch_level = (staged['arrival_year'][0].as_py(), staged['arrival_month'][0].as_py())
+            assert data_level is None or data_level==batch_level
+            data_level  = batch_level
+
+            seen_admnums = np.union1d(seen_admnums, staged['admnum'].to_numpy())
+            yield staged
+
+        assert data_level is not None
+
+    @staticmethod
+    def stage_row_groups(filesystem, path, row_groups, part_path, engine='pandas'):
+        '''
+        Process pool task staging a subset of the row groups of a raw i94 file into its own part file. Duplicated admnums
+        are only removed within the subset, so the staged admnums are returned for the global de-duplication pass, along
+        with the year and month of the staged records, or None if no record of the subset was kept.
+        '''
+        with filesystem.open(path, 'rb') as raw_file:
+            table = pq.ParquetFile(raw_file).read_row_groups(row_groups, columns=ImmigrationTransforms.input_columns)
+
+        # An empty set of seen admnums makes the transforms return an empty table for a piece left without records
+        seen_admnums = np.empty(0, dtype=np.int64)
+        if engine=='arrow':
+            staged = ImmigrationTransforms.stage_arrow(table, seen_admnums)
+        else:
+            staged = pa.Table.from_pandas(ImmigrationTransforms.stage(table.to_pandas(), seen_admnums),
+                                          schema         = ImmigrationTransforms.output_schema,
+                                          preserve_index = False)
+        pq.write_table(staged, part_path)
+        data_level = (staged['arrival_year'][0].as_py(), staged['arrival_month'][0].as_py()) if staged.num_rows else None
+        return part_path, staged['admnum'].to_numpy(), data_level
@@ -0,0 +1,117 @@
+import contextlib
+import queue
+import threading
+
+
+class RedshiftSession:
+
+    '''
+    Pool of warehouse connections opened through a PostgresHook and reused across the statements of a task, so that
+    each statement no longer pays for a new TLS handshake and session setup. Connections are opened lazily up to
+    max_connections, handed to one caller at a time and returned to the pool afterwards, so the session can be shared
+    by the threads of a task. Several statements can be pipelined through run_many, which sends them to the leader node
+    as a single query in one round trip.
+
+    - Inputs:
+        * hook: PostgresHook whose get_conn() opens the connections
+        * max_connections: Maximum number of connections opened at once
+        * statement_timeout: Optional timeout in milliseconds set on every connection, after which the leader node
+          cancels the running statement
+
+    - Outputs: Context manager closing every pooled connection on exit
+    '''
+
+    def __init__(self, hook, max_connections=4, statement_timeout=None):
+        self.hook              = hook
+        self.max_connections   = max_connections
+        self.statement_timeout = statement_timeout
+        self.idle              = queue.LifoQueue()
+        self.slots             = threading.BoundedSemaphore(max_connections)
+        self.opened            = []
+        self.lock              = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        conn = self.hook.get_conn()
+        if self.statement_timeout:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SET statement_timeout TO {int(self.statement_timeout)};")
+            conn.commit()
+        with self.lock:
+            self.opened.append(conn)
+        return conn
+
+    def discard(self, conn):
+        with self.lock:
+            self.opened.remove(conn)
+        with contextlib.suppress(Exception):
+            conn.close()
+
+    @contextlib.contextmanager
+    def connection(self):
+        ''' Checks out a pooled connection, rolling back whatever it left uncommitted before returning it '''
+        self.slots.acquire()
+        conn = None
+        try:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = self.open()
+            yield conn
+        except BaseException:
+            if conn is not None and not conn.closed:
+                with contextlib.suppress(Exception):
+                    conn.rollback()
+            raise
+        finally:
+            if conn is not None:
+                if conn.closed:
+                    self.discard(conn)
+                else:
+                    self.idle.put(conn)
+            self.slots.release()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        ''' Yields a cursor whose statements are committed together on exit, or rolled back if the block raises '''
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+
+    @contextlib.contextmanager
+    def table_lock(self, table_name):
+        '''
+        Holds an exclusive lock on the table until the block exits, so that the block never overlaps with another one
+        locking the same table from any task or run. The lock is released when its connection drops if the task dies
+        '''
+        with self.transaction() as cursor:
+            cursor.execute(f"LOCK {table_name};")
+            yield
+
+    def run(self, sql, parameters=None):
+        with self.transaction() as cursor:
+            cursor.execute(sql, parameters)
+
+    def run_many(self, statements):
+        ''' Pipelines the statements through a single query, committed as one transaction '''
+        with self.transaction() as cursor:
+            cursor.execute(';\n'.join(statement.strip().rstrip(';') for statement in statements) + ';')
+
+    def get_records(self, sql, parameters=None):
+        with self.transaction() as cursor:
+            cursor.execute(sql, parameters)
+            return cursor.fetchall()
+
+    def close(self):
+        with self.lock:
+            opened, self.opened = self.opened, []
+        for conn in opened:
+            with contextlib.suppress(Exception):
+                conn.close()
+        self.idle = queue.LifoQueue()
@@ -0,0 +1,46 @@
+import io
+import tempfile
+
+
+class SpooledS3Upload:
+
+    '''
+    Context manager handing out a writable buffer that is uploaded to S3 on exit. The buffer lives in memory and only
+    spills to a private temporary file once it grows beyond spool_threshold bytes, so staged outputs never go through the
+    worker's current working directory. The upload goes through S3Hook.load_file_obj, which switches to a multipart
+    upload for large objects.
+
+    - Inputs:
+        * s3_hook: S3Hook used for the upload
+        * bucket_name: Destination bucket
+        * key: Destination key
+        * spool_threshold: Maximum number of bytes held in memory before the buffer rolls over to disk
+
+    - Outputs: Object uploaded to s3://{bucket_name}/{key} if the block exits without errors, with its size in bytes
+               available as the size attribute
+    '''
+
+    default_spool_threshold = 256 * 1024 * 1024
+
+    def __init__(self, s3_hook, bucket_name, key, spool_threshold=default_spool_threshold):
+        self.s3_hook         = s3_hook
+        self.bucket_name     = bucket_name
+        self.key             = key
+        self.spool_threshold = spool_threshold
+        self.size            = None
+
+    def __enter__(self):
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        return self.buffer
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.size = self.buffer.seek(0, io.SEEK_END)
+                self.buffer.seek(0)
+                self.s3_hook.load_file_obj(self.buffer,
+                                           key         = self.key,
+                                           bucket_name = self.bucket_name,
+                                           replace     = True)
+        finally:
+            self.buffer.close()
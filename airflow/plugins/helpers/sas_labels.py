@@ -0,0 +1,121 @@
+import hashlib
+import inspect
+import json
+import os
+import pandas as pd
+import re
+import stat
+import tempfile
+
+
+class SasLabels:
+
+    '''
+    Parser of the I94_SAS_Labels_Descriptions.SAS file into the code to name mappings of the immigration dimensions.
+    Each SAS "value {format} ... ;" block is read into the table listed in value_formats, while the trip reasons, which
+    the file only lists inside the I94VISA comment, are read from that comment. Codes are read as integers unless they
+    are quoted, and names keep their text with runs of blanks collapsed into a single space and doubled quotes unescaped.
+
+    The parsed dimensions are cached as a JSON artifact named after the hash of the SAS file and of this parser, so
+    that the file is only parsed again when either of them changes. Artifacts are kept in a directory private to the
+    user running the worker, and are never cached in a directory other users can write to.
+
+    - Inputs:
+        * path: Path to the SAS labels file
+        * cache_dir: Directory holding the cached artifacts, defaulting to cache/sas_labels under AIRFLOW_HOME
+
+    - Outputs: Dict mapping each table name to a dict of the codes of the dimension and their names, which to_csv
+               serializes as staged and content_hash identifies in immigration.dimension_versions
+    '''
+
+    value_formats = {'i94cntyl': 'country_codes',
+                     '$i94prtl': 'port_codes',
+                     'i94model': 'entry_channel_codes',
+                     'i94addrl': 'state_codes'}
+
+    comment_formats = {'I94VISA': 'trip_reason_codes'}
+
+    value_block   = re.compile(r"\bvalue\s+(\$?\w+)(.*?);", re.IGNORECASE | re.DOTALL)
+    value_entry   = re.compile(r"('[^']*'|[^\s=']+)\s*=\s*'((?:[^']|'')*)'")
+    comment_block = re.compile(r"/\*(.*?)\*/", re.DOTALL)
+    comment_entry = re.compile(r"^\s*(\d+)\s*=\s*(.+?)\s*$", re.MULTILINE)
+
+    @staticmethod
+    def clean_name(name):
+        return re.sub(r'\s+', ' ', name).replace("''", "'")
+
+    @staticmethod
+    def parse(text):
+        ''' Parses the content of the SAS labels file into the dimensions listed in value_formats and comment_formats '''
+        comments   = SasLabels.comment_block.findall(text)
+        dimensions = {}
+        for comment in comments:
+            variable = comment.strip().split(' ', 1)[0]
+            if variable in SasLabels.comment_formats:
+                dimensions[SasLabels.comment_formats[variable]] = {int(code): SasLabels.clean_name(name)
+                                                                   for code, name in SasLabels.comment_entry.findall(comment)}
+
+        for format_name, body in SasLabels.value_block.findall(SasLabels.comment_block.sub('', text)):
+            if format_name.lower() not in SasLabels.value_formats:
+                continue
+            records = {}
+            for code, name in SasLabels.value_entry.findall(body):
+                code = code.strip("'").strip() if code.startswith("'") else int(code)
+                records[code] = SasLabels.clean_name(name)
+            dimensions[SasLabels.value_formats[format_name.lower()]] = records
+
+        missing = set(SasLabels.value_formats.values()) | set(SasLabels.comment_formats.values())
+        missing = missing - set(dimensions)
+        if missing:
+            raise ValueError(f"SAS labels file has no definition for the dimensions {sorted(missing)}")
+        return dimensions
+
+    @staticmethod
+    def to_csv(records):
+        return pd.DataFrame([[x,y] for x,y in zip(records.keys(), records.values())],
+                            columns = ['code', 'name']).to_csv(sep=';', index=False)
+
+    @staticmethod
+    def content_hash(records):
+        ''' SHA-256 hash of the staged CSV of a dimension, shared by the staging and the direct insert paths '''
+        return hashlib.sha256(SasLabels.to_csv(records).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def default_cache_dir():
+        return os.path.join(os.environ.get('AIRFLOW_HOME', os.path.expanduser('~/airflow')), 'cache', 'sas_labels')
+
+    @staticmethod
+    def private_dir(directory):
+        ''' Creates the directory with 0700 permissions, returning False if it is owned or writable by another user '''
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        status = os.stat(directory)
+        if status.st_uid!=os.getuid():
+            return False
+        if status.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            os.chmod(directory, 0o700)
+        return True
+
+    @staticmethod
+    def load(path, cache_dir=None):
+        '''
+        Returns the parsed dimensions of the SAS labels file, read from the cached artifact of its current content when
+        available, and otherwise parsed and cached
+        '''
+        with open(path, 'rb') as labels_file:
+            content = labels_file.read()
+        digest     = hashlib.sha256(content + inspect.getsource(SasLabels).encode('utf-8')).hexdigest()
+        cache_dir  = cache_dir or SasLabels.default_cache_dir()
+        cache_path = os.path.join(cache_dir, f"i94_sas_labels_{digest[:16]}.json")
+        if not SasLabels.private_dir(cache_dir):
+            return SasLabels.parse(content.decode('latin-1'))
+
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as cache_file:
+                return {table_name: {code: name for code, name in records}
+                        for table_name, records in json.load(cache_file).items()}
+
+        dimensions = SasLabels.parse(content.decode('latin-1'))
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir, delete=False) as cache_file:
+            json.dump({table_name: list(records.items()) for table_name, records in dimensions.items()}, cache_file)
+        os.replace(cache_file.name, cache_path)
+        return dimensions
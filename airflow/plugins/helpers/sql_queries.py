@@ -12,11 +12,11 @@ class SqlQueries:
         admnum bigint NOT NULL,
         i94bir double precision,
         gender varchar(1),
-        i94visa varchar,
-        i94cit varchar,
-        i94res varchar,
+        i94visa smallint,
+        i94cit smallint,
+        i94res smallint,
         i94addr varchar,
-        i94mode varchar,
+        i94mode smallint,
         arrival_day bigint,
         arrival_month bigint,
         arrival_year bigint,
@@ -52,16 +52,48 @@ class SqlQueries:
         trip_reason varchar
         )
     ;
+    CREATE TABLE IF NOT EXISTS immigration.dimension_versions (
+        table_name varchar,
+        content_hash varchar(64),
+        loaded_at timestamp
+        )
+    ;
+    CREATE TABLE IF NOT EXISTS immigration.admnum_index_lock (
+        locked_by varchar
+        )
+    ;
     CREATE TABLE IF NOT EXISTS temperature.full_temperature_data (
-        dt varchar,
+        dt date,
         averagetemperature double precision,
         averagetemperatureuncertainty double precision,
         city varchar,
         country varchar,
-        latitude varchar,
-        longitude varchar)
+        latitude double precision,
+        longitude double precision)
     SORTKEY(country)
     ;
+    CREATE TABLE IF NOT EXISTS temperature.load_watermarks (
+        table_name varchar,
+        watermark date,
+        history_rows bigint,
+        history_checksum bigint,
+        source_fingerprint varchar(64)
+        )
+    ;
+    CREATE TABLE IF NOT EXISTS temperature.temp_stats (
+        country varchar,
+        n bigint,
+        mean double precision,
+        m2 double precision,
+        watermark date
+        )
+    ;
+    CREATE TABLE IF NOT EXISTS temperature.temp_summary (
+        country_name varchar,
+        mean_temp double precision,
+        stddev_temp double precision
+        )
+    ;
     COMMIT;
     """
     
@@ -70,26 +102,128 @@ class SqlQueries:
     COMMIT;
     """
     
+    copy_immigration_data_from_manifest = """
+    COPY immigration.us_entries FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET MANIFEST;
+    COMMIT;
+    """
+    
+    dimension_versions = """
+    SELECT table_name, content_hash FROM immigration.dimension_versions;
+    """
+    
+    record_dimension_version = """
+    DELETE FROM immigration.dimension_versions WHERE table_name = '{0}';
+    INSERT INTO immigration.dimension_versions VALUES ('{0}', '{1}', GETDATE());
+    """
+    
+    clear_dimension_version = """
+    DELETE FROM immigration.dimension_versions WHERE table_name = '{}';
+    """
+    
+    stage_immigration_month = """
+    CREATE TEMP TABLE staged_us_entries (LIKE immigration.us_entries);
+    COPY staged_us_entries FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET;
+    """
+    
+    stage_immigration_month_from_manifest = """
+    CREATE TEMP TABLE staged_us_entries (LIKE immigration.us_entries);
+    COPY staged_us_entries FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET MANIFEST;
+    """
+    
+    merge_immigration_month = """
+    LOCK immigration.us_entries;
+    DELETE FROM immigration.us_entries WHERE arrival_year = {} AND arrival_month = {};
+    INSERT INTO immigration.us_entries (SELECT * FROM staged_us_entries);
+    """
+    
+    drop_staged_immigration_month = """
+    DROP TABLE staged_us_entries;
+    """
+    
     copy_temperature_data = """
-    TRUNCATE TABLE temperature.full_temperature_data;
-    COPY temperature.full_temperature_data FROM '{}' IGNOREHEADER AS 1 DELIMITER ',' IAM_ROLE '{}';
+    BEGIN;
+    LOCK temperature.full_temperature_data;
+    DELETE FROM temperature.full_temperature_data;
+    COPY temperature.full_temperature_data FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET MANIFEST;
+    DELETE FROM temperature.load_watermarks WHERE table_name = 'temperature.full_temperature_data';
+    DELETE FROM temperature.temp_stats;
+    COMMIT;
+    """
+    
+    copy_temperature_stats = """
+    BEGIN;
+    LOCK temperature.temp_stats;
+    DELETE FROM temperature.temp_stats;
+    COPY temperature.temp_stats FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET MANIFEST;
+    LOCK temperature.temp_summary;
+    DELETE FROM temperature.temp_summary;
+    INSERT INTO temperature.temp_summary (
+        SELECT UPPER(country) as country_name, mean as mean_temp, SQRT(m2 / n) as stddev_temp 
+        FROM temperature.temp_stats);
     COMMIT;
     """
     
+    lock_temperature_data = """
+    LOCK temperature.full_temperature_data;
+    """
+    
+    temperature_watermark = """
+    SELECT watermark, history_rows, history_checksum, source_fingerprint FROM temperature.load_watermarks 
+    WHERE table_name = 'temperature.full_temperature_data';
+    """
+    
+    append_temperature_increment = """
+    DELETE FROM temperature.full_temperature_data WHERE dt > '{}';
+    COPY temperature.full_temperature_data FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET MANIFEST;
+    """
+    
+    reload_temperature_data = """
+    DELETE FROM temperature.temp_stats;
+    DELETE FROM temperature.full_temperature_data;
+    COPY temperature.full_temperature_data FROM '{}' IAM_ROLE '{}' FORMAT AS PARQUET MANIFEST;
+    """
+    
+    record_temperature_watermark = """
+    DELETE FROM temperature.load_watermarks WHERE table_name = 'temperature.full_temperature_data';
+    INSERT INTO temperature.load_watermarks VALUES ('temperature.full_temperature_data', %s, %s, %s, %s);
+    """
+    
     run_temps_summary = """
-    DROP TABLE IF EXISTS temperature.temp_summary;
-    CREATE TABLE temperature.temp_summary AS (
-        SELECT UPPER(country) as country_name, AVG(averagetemperature) as mean_temp, STDDEV_POP(averagetemperature) as stddev_temp 
-        FROM temperature.full_temperature_data 
-        GROUP BY country);
+    BEGIN;
+    LOCK temperature.temp_stats;
+    CREATE TEMP TABLE batch_temp_stats AS (
+        SELECT data.country, COUNT(*) AS n, AVG(data.averagetemperature) AS mean, 
+               VAR_POP(data.averagetemperature) * COUNT(*) AS m2, MAX(data.dt) AS watermark
+        FROM temperature.full_temperature_data AS data
+        LEFT JOIN temperature.temp_stats AS stats ON stats.country = data.country
+        WHERE data.averagetemperature IS NOT NULL AND (stats.watermark IS NULL OR data.dt > stats.watermark)
+        GROUP BY data.country);
+    UPDATE temperature.temp_stats
+    SET n         = temp_stats.n + batch.n,
+        mean      = temp_stats.mean + (batch.mean - temp_stats.mean) * batch.n / (temp_stats.n + batch.n),
+        m2        = temp_stats.m2 + batch.m2 + (batch.mean - temp_stats.mean) * (batch.mean - temp_stats.mean) * temp_stats.n * batch.n / (temp_stats.n + batch.n),
+        watermark = batch.watermark
+    FROM batch_temp_stats AS batch
+    WHERE temp_stats.country = batch.country;
+    INSERT INTO temperature.temp_stats (
+        SELECT batch.country, batch.n, batch.mean, batch.m2, batch.watermark 
+        FROM batch_temp_stats AS batch
+        LEFT JOIN temperature.temp_stats AS stats ON stats.country = batch.country
+        WHERE stats.country IS NULL);
+    DROP TABLE batch_temp_stats;
+    LOCK temperature.temp_summary;
+    DELETE FROM temperature.temp_summary;
+    INSERT INTO temperature.temp_summary (
+        SELECT UPPER(country) as country_name, mean as mean_temp, SQRT(m2 / n) as stddev_temp 
+        FROM temperature.temp_stats);
     COMMIT;
     """
     
     demographics_by_channel = """
     CREATE TABLE outputs.{}{}_demographics_by_channel AS (
         SELECT codes.entry_channel, data.gender, data.average_age FROM (
-            (SELECT CAST(CAST(i94mode AS DOUBLE PRECISION) AS INT) as code, gender, AVG(i94bir) as average_age
-            FROM immigration.us_entries WHERE arrival_month={} and arrival_year={} and i94bir>0 and i94mode!='nan'
+            (SELECT i94mode as code, gender, AVG(i94bir) as average_age
+            FROM immigration.us_entries WHERE arrival_month={} and arrival_year={} and i94bir>0 and i94mode IS NOT NULL
             GROUP BY i94mode, gender) AS data
             LEFT JOIN immigration.entry_channel_codes AS codes
             ON codes.code = data.code));
@@ -99,7 +233,7 @@ class SqlQueries:
     length_of_stay = """
     CREATE TABLE outputs.{}{}_length_of_stay AS (
         SELECT codes.country_name, data.average_stay FROM (
-            (SELECT CAST(CAST(i94res AS DOUBLE PRECISION) AS INT) as code, AVG(length_of_stay) as average_stay
+            (SELECT i94res as code, AVG(length_of_stay) as average_stay
             FROM immigration.us_entries WHERE arrival_month={} and arrival_year={} and length_of_stay>=0
             GROUP BY i94res) AS data
             LEFT JOIN immigration.country_codes AS codes
@@ -110,8 +244,8 @@ class SqlQueries:
     state_trip_reasons = """
     CREATE TABLE outputs.{}{}_state_trip_reasons AS (
         SELECT sc.state_name, tr.trip_reason, data.count FROM (
-            (SELECT i94addr as state_code, CAST(CAST(i94visa AS DOUBLE PRECISION) AS INT) as trip_reason_code, count(*) as count
-            FROM immigration.us_entries WHERE arrival_month={} and arrival_year={} and i94visa!='nan'
+            (SELECT i94addr as state_code, i94visa as trip_reason_code, count(*) as count
+            FROM immigration.us_entries WHERE arrival_month={} and arrival_year={} and i94visa IS NOT NULL
             GROUP BY i94addr, i94visa) AS data
             LEFT JOIN immigration.state_codes AS sc
             ON sc.code = data.state_code
@@ -125,7 +259,7 @@ class SqlQueries:
         SELECT codes.country_name, data.visitor_count, temps.mean_temp, temps.stddev_temp FROM (
             immigration.country_codes AS codes
             JOIN (
-                SELECT CAST(CAST(i94res AS DOUBLE PRECISION) AS INT) as code, COUNT(*) as visitor_count
+                SELECT i94res as code, COUNT(*) as visitor_count
                 FROM immigration.us_entries WHERE arrival_month={} and arrival_year={}
                 GROUP BY i94res) AS data
             ON codes.code = data.code
@@ -0,0 +1,52 @@
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class StagedParts:
+
+    '''
+    Splitting of a staged parquet file into similarly sized part files, plus the Redshift COPY manifest listing them, so
+    that a COPY ... MANIFEST spreads the load across every slice of the cluster.
+
+    - Inputs: Staged parquet file and the number of parts to produce, usually a multiple of the cluster slice count
+
+    - Outputs: Data of each part file and the JSON manifest referencing their S3 locations
+    '''
+
+    @staticmethod
+    def iter_parts(staged_file, parts, batch_size=100000):
+        '''
+        Streams the staged file (a path or a readable file object) as the requested number of parts with the same number
+        of rows, give or take one. Yields one iterator of pyarrow Tables per part, which has to be consumed before moving
+        on to the next part, so that only one batch is held in memory at any time.
+        '''
+        parquet_file = pq.ParquetFile(staged_file)
+        total_rows   = parquet_file.metadata.num_rows
+        parts        = max(1, min(parts, total_rows))
+        batches      = parquet_file.iter_batches(batch_size=batch_size)
+        pending      = [None]
+
+        def part_tables(rows):
+            while rows:
+                if pending[0] is None or pending[0].num_rows==0:
+                    pending[0] = next(batches)
+                taken      = min(rows, pending[0].num_rows)
+                yield pa.Table.from_batches([pending[0].slice(0, taken)])
+                pending[0] = pending[0].slice(taken)
+                rows      -= taken
+
+        for index in range(parts):
+            yield part_tables(total_rows // parts + (1 if index < total_rows % parts else 0))
+
+    @staticmethod
+    def manifest(urls_and_sizes):
+        '''
+        Redshift COPY manifest for the given (s3 url, size in bytes) pairs. Columnar formats require the content_length
+        of every entry, and every part is mandatory so a missing object fails the COPY instead of loading partial data.
+        '''
+        return json.dumps({'entries': [{'url'      : url,
+                                        'mandatory': True,
+                                        'meta'     : {'content_length': size}}
+                                       for url, size in urls_and_sizes]},
+                          indent=2)
@@ -0,0 +1,61 @@
+import hashlib
+import inspect
+import json
+
+
+class StagingCache:
+
+    '''
+    Skip cache for staging operators. A staging run is fingerprinted by the ETag and size of its raw S3 object, the
+    version of the code that transforms it and the parameters that shape its output. The fingerprint is stored as a small
+    JSON manifest next to the staged output, and a later run with the same fingerprint can skip staging altogether as
+    long as the staged objects are still in place. The outputs of a run, such as its load plan, can be stored with the
+    fingerprint and read back by the later runs that skip staging.
+
+    - Inputs:
+        * s3_hook: S3Hook used to inspect the raw and staged objects and to store the manifest
+        * bucket_name: Bucket holding the staged output and the manifest
+        * manifest_key: Key of the manifest within the bucket
+
+    - Outputs: Fingerprint manifest stored at s3://{bucket_name}/{manifest_key}
+    '''
+
+    def __init__(self, s3_hook, bucket_name, manifest_key):
+        self.s3_hook      = s3_hook
+        self.bucket_name  = bucket_name
+        self.manifest_key = manifest_key
+
+    @staticmethod
+    def code_version(*code_objects):
+        ''' Hash of the source code of the classes or functions implementing the staging step '''
+        source = ''.join(inspect.getsource(code_object) for code_object in code_objects)
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def fingerprint(self, source_bucket, source_key, code_version, parameters=None):
+        source = self.s3_hook.get_key(source_key, bucket_name=source_bucket)
+        return {'source'      : f"s3://{source_bucket}/{source_key}",
+                'source_etag' : source.e_tag,
+                'source_size' : source.content_length,
+                'code_version': code_version,
+                'parameters'  : parameters or {}}
+
+    def is_fresh(self, fingerprint):
+        ''' True if the stored manifest matches the fingerprint and every staged key it lists still exists '''
+        if not self.s3_hook.check_for_key(self.manifest_key, bucket_name=self.bucket_name):
+            return False
+        stored = json.loads(self.s3_hook.read_key(self.manifest_key, bucket_name=self.bucket_name))
+        if stored.get('fingerprint')!=fingerprint:
+            return False
+        return all(self.s3_hook.check_for_key(key, bucket_name=self.bucket_name) for key in stored.get('staged_keys', []))
+
+    def outputs(self):
+        ''' Outputs recorded with the stored fingerprint '''
+        return json.loads(self.s3_hook.read_key(self.manifest_key, bucket_name=self.bucket_name)).get('outputs')
+
+    def record(self, fingerprint, staged_keys, outputs=None):
+        self.s3_hook.load_string(string_data = json.dumps({'fingerprint': fingerprint,
+                                                           'staged_keys': staged_keys,
+                                                           'outputs'    : outputs}, indent=2),
+                                 key         = self.manifest_key,
+                                 bucket_name = self.bucket_name,
+                                 replace     = True)
@@ -0,0 +1,213 @@
+import hashlib
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+
+class TemperatureTransforms:
+
+    '''
+    Cleaning of the GlobalLandTemperaturesByCity.csv file before it is staged. The CSV is streamed in blocks parsed by
+    the multithreaded Arrow CSV reader, dates are parsed into dates, coordinates such as 57.05N or 10.33W are parsed into
+    signed degrees (south and west being negative) and records without an average temperature are dropped.
+
+    - Inputs: Readable file object with the raw CSV
+
+    - Outputs: pyarrow Tables with output_schema, written as compressed parquet files partitioned by country. The country
+               column is kept inside the files, so that Redshift can COPY them as they are. Alternatively, a table with
+               stats_schema holding the count, mean, sum of squared deviations and latest date of the temperatures of
+               each country, in the layout of temperature.temp_stats. When loading incrementally, only the rows dated after
+               the loaded watermark are kept, while the rows up to it are fingerprinted by their count and checksum
+    '''
+
+    raw_columns   = {'dt'                           : pa.date32(),
+                     'AverageTemperature'           : pa.float64(),
+                     'AverageTemperatureUncertainty': pa.float64(),
+                     'City'                         : pa.string(),
+                     'Country'                      : pa.string(),
+                     'Latitude'                     : pa.string(),
+                     'Longitude'                    : pa.string()}
+
+    output_schema = pa.schema([('dt',                            pa.date32()),
+                               ('averagetemperature',            pa.float64()),
+                               ('averagetemperatureuncertainty', pa.float64()),
+                               ('city',                          pa.string()),
+                               ('country',                       pa.string()),
+                               ('latitude',                      pa.float64()),
+                               ('longitude',                     pa.float64())])
+
+    stats_schema  = pa.schema([('country',   pa.string()),
+                               ('n',         pa.int64()),
+                               ('mean',      pa.float64()),
+                               ('m2',        pa.float64()),
+                               ('watermark', pa.date32())])
+
+    history_columns = ['city', 'country', 'dt', 'averagetemperature']
+
+    compression = 'snappy'
+
+    default_block_size = 16 * 1024 * 1024
+
+    @staticmethod
+    def parse_coordinates(values):
+        degrees    = pc.cast(pc.utf8_slice_codeunits(values, 0, -1), pa.float64())
+        hemisphere = pc.utf8_slice_codeunits(values, -1)
+        return pc.if_else(pc.fill_null(pc.is_in(hemisphere, value_set=pa.array(['S', 'W'])), False),
+                          pc.negate(degrees), degrees)
+
+    @staticmethod
+    def clean(batch):
+        table = pa.Table.from_batches([batch])
+        table = table.filter(pc.is_valid(table['AverageTemperature']))
+        return pa.Table.from_arrays([table['dt'],
+                                     table['AverageTemperature'],
+                                     table['AverageTemperatureUncertainty'],
+                                     table['City'],
+                                     table['Country'],
+                                     TemperatureTransforms.parse_coordinates(table['Latitude']),
+                                     TemperatureTransforms.parse_coordinates(table['Longitude'])],
+                                    schema=TemperatureTransforms.output_schema)
+
+    @staticmethod
+    def read_clean(raw_file, block_size=default_block_size):
+        ''' Streams the raw CSV as cleaned tables, one per block of block_size bytes '''
+        reader = pacsv.open_csv(raw_file,
+                                read_options    = pacsv.ReadOptions(use_threads=True, block_size=block_size),
+                                convert_options = pacsv.ConvertOptions(column_types    = TemperatureTransforms.raw_columns,
+                                                                       include_columns = list(TemperatureTransforms.raw_columns)))
+        for batch in reader:
+            if batch.num_rows:
+                yield TemperatureTransforms.clean(batch)
+
+    @staticmethod
+    def partition_name(country):
+        ''' Key safe name of a country, suffixed with a short hash of its raw name so that no two countries share it '''
+        if country is None:
+            return 'unknown'
+        name = re.sub(r'[^A-Za-z0-9]+', '_', country).strip('_')
+        return f"{name}-{hashlib.sha1(country.encode('utf-8')).hexdigest()[:8]}"
+
+    @staticmethod
+    def split_by_country(table):
+        ''' Yields (country, table) pairs holding the rows of each country present in the table, None for a null country '''
+        if table.num_rows==0:
+            return
+        table     = table.take(pc.sort_indices(table['country']))
+        countries = table['country'].combine_chunks().dictionary_encode(null_encoding='encode')
+        codes     = countries.indices.to_numpy(zero_copy_only=False)
+        bounds    = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            yield countries.dictionary[codes[start]].as_py(), table.slice(start, end - start)
+
+    @staticmethod
+    def write_partitions(tables, open_part, row_group_size=100000, max_pending_rows=1000000):
+        '''
+        Writes the cleaned tables into parquet part files partitioned by country. Rows are buffered per country and a
+        country is written as a new part file once row_group_size of its rows are pending, or once the rows pending
+        across every country exceed max_pending_rows, in which case the countries with the most pending rows are written
+        first. open_part(country, index) must return a context manager yielding the writable file of a part, which is
+        closed as soon as the part is written, so memory stays bounded by max_pending_rows whatever the size of the data.
+        Returns the number of rows written per country.
+        '''
+        pending, pending_rows, parts, rows = {}, {}, {}, {}
+
+        def flush(country):
+            with open_part(country, parts.get(country, 0)) as part_file:
+                pq.write_table(pa.concat_tables(pending.pop(country)), part_file,
+                               row_group_size = row_group_size,
+                               compression    = TemperatureTransforms.compression)
+            parts[country] = parts.get(country, 0) + 1
+            pending_rows.pop(country)
+
+        for table in tables:
+            for country, country_table in TemperatureTransforms.split_by_country(table):
+                pending.setdefault(country, []).append(country_table)
+                pending_rows[country] = pending_rows.get(country, 0) + country_table.num_rows
+                rows[country]         = rows.get(country, 0) + country_table.num_rows
+                if pending_rows[country] >= row_group_size:
+                    flush(country)
+            while sum(pending_rows.values()) > max_pending_rows:
+                flush(max(pending_rows, key=pending_rows.get))
+        for country in list(pending):
+            flush(country)
+        return rows
+
+    @staticmethod
+    def row_checksum(table):
+        ''' Order independent checksum of the rows of a cleaned table, as the sum of a 64 bit hash of each row modulo 2^64 '''
+        rows = table.select(TemperatureTransforms.history_columns).to_pandas(date_as_object=False)
+        return int(pd.util.hash_pandas_object(rows, index=False).to_numpy().sum(dtype=np.uint64))
+
+    @staticmethod
+    def signed_checksum(checksum):
+        ''' Checksum modulo 2^64 as the signed 64 bit integer stored in a bigint column '''
+        checksum %= 2**64
+        return checksum - 2**64 if checksum >= 2**63 else checksum
+
+    @staticmethod
+    def split_increment(tables, watermark, history):
+        '''
+        Yields the cleaned rows dated after the watermark, or every row if it is None. The history dict accumulates the
+        count and checksum of the rows up to the watermark (history_rows, history_checksum), of the whole series (rows,
+        checksum) and its latest date (watermark), which are complete once the tables are exhausted.
+        '''
+        history.update({'history_rows': 0, 'history_checksum': 0, 'rows': 0, 'checksum': 0, 'watermark': None})
+        for table in tables:
+            if table.num_rows==0:
+                continue
+            latest = pc.max(table['dt']).as_py()
+            history['rows']     += table.num_rows
+            history['checksum']  = (history['checksum'] + TemperatureTransforms.row_checksum(table)) % 2**64
+            history['watermark'] = latest if history['watermark'] is None else max(history['watermark'], latest)
+            if watermark is None:
+                yield table
+                continue
+
+            recent        = pc.greater(table['dt'], pa.scalar(watermark, pa.date32()))
+            history_table = table.filter(pc.invert(recent))
+            history['history_rows']     += history_table.num_rows
+            history['history_checksum']  = (history['history_checksum'] + TemperatureTransforms.row_checksum(history_table)) % 2**64
+            increment = table.filter(recent)
+            if increment.num_rows:
+                yield increment
+
+    @staticmethod
+    def merge_stats(stats, block):
+        ''' Merges two frames of per-country n, mean, m2 and watermark with Chan's parallel update of Welford's state '''
+        if stats is None:
+            return block
+        joined = stats.join(block, how='outer', lsuffix='_a', rsuffix='_b')
+        n_a, n_b       = joined.n_a.fillna(0).to_numpy(),    joined.n_b.fillna(0).to_numpy()
+        mean_a, mean_b = joined.mean_a.fillna(0).to_numpy(), joined.mean_b.fillna(0).to_numpy()
+        n     = n_a + n_b
+        delta = mean_b - mean_a
+        return pd.DataFrame({'n'        : n.astype('int64'),
+                             'mean'     : mean_a + delta * n_b / n,
+                             'm2'       : joined.m2_a.fillna(0).to_numpy() + joined.m2_b.fillna(0).to_numpy() + delta * delta * n_a * n_b / n,
+                             'watermark': joined[['watermark_a', 'watermark_b']].max(axis=1)},
+                            index=joined.index)
+
+    @staticmethod
+    def summarize(tables):
+        '''
+        One-pass summary of a stream of cleaned tables: each table is aggregated per country and merged into the running
+        state, so only one block of raw data and one row per country are held in memory. Returns a table with stats_schema.
+        '''
+        stats = None
+        for table in tables:
+            data  = table.select(['country', 'averagetemperature', 'dt']).to_pandas(date_as_object=False)
+            group = data.groupby('country')
+            block = pd.DataFrame({'n'        : group.averagetemperature.count(),
+                                  'mean'     : group.averagetemperature.mean(),
+                                  'm2'       : group.averagetemperature.var(ddof=0) * group.averagetemperature.count(),
+                                  'watermark': group.dt.max()})
+            stats = TemperatureTransforms.merge_stats(stats, block)
+        if stats is None:
+            return TemperatureTransforms.stats_schema.empty_table()
+        return pa.Table.from_pandas(stats.rename_axis('country').reset_index(),
+                                    schema         = TemperatureTransforms.stats_schema,
+                                    preserve_index = False)
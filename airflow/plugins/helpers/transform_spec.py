@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class TransformSpec:
+
+    '''
+    Declarative description of a staging transform: output columns and types, domain constraints, derived expressions
+    and data level checks. The spec is compiled once into a CompiledTransform, which only reads and computes what
+    reaches the output or a check and applies the whole transform to a pandas DataFrame or a pyarrow Table.
+
+    - Inputs:
+        * schema: pyarrow schema of the output, which sets both the projection and the output types
+        * key: Column identifying a record. Records with a null key or a key in drop_keys are dropped, and only the first
+               record of each key is kept
+        * drop_keys: Key values flagging records that must not be staged
+        * constraints: Dict of column to domain rule, either ('isin', values) or (comparison, bound) with a comparison
+                       in '>=', '>', '<=', '<'. Values breaking the rule are staged as nulls
+        * derived: Dict of column to derived expression, either (part, source) with a part in 'day', 'month', 'year'
+                   of a date given in days since date_epoch, or ('days_between', start, end)
+        * checks: List of data level checks, either ('constant', column) or ('equal', column, other_column)
+        * date_epoch: Date from which the day counts of the source date columns are measured
+        * na_value: Value given to derived columns that cannot be computed
+
+    - Outputs: CompiledTransform returned by compile()
+    '''
+
+    comparisons = {'>=': (np.greater_equal, pc.greater_equal),
+                   '>' : (np.greater,       pc.greater),
+                   '<=': (np.less_equal,    pc.less_equal),
+                   '<' : (np.less,          pc.less)}
+
+    date_parts  = ('day', 'month', 'year')
+
+    def __init__(self, schema, key, drop_keys=(), constraints=None, derived=None, checks=None,
+                 date_epoch=pd.Timestamp('1970-1-1'), na_value=-9999):
+        self.schema      = schema
+        self.key         = key
+        self.drop_keys   = list(drop_keys)
+        self.constraints = constraints or {}
+        self.derived     = derived or {}
+        self.checks      = checks or []
+        self.date_epoch  = date_epoch
+        self.na_value    = na_value
+
+    def compile(self):
+
+        for column, rule in self.constraints.items():
+            if rule[0]!='isin' and rule[0] not in TransformSpec.comparisons:
+                raise ValueError(f"Unknown constraint {rule[0]} on column {column}")
+        for column, expression in self.derived.items():
+            if expression[0] not in TransformSpec.date_parts + ('days_between',):
+                raise ValueError(f"Unknown derived expression {expression[0]} for column {column}")
+        for check in self.checks:
+            if check[0] not in ('constant', 'equal'):
+                raise ValueError(f"Unknown check {check[0]}")
+
+        # Only the derived columns reaching the output or a check are computed, and only their sources are read
+        checked  = [column for check in self.checks for column in check[1:]]
+        derived  = {column: expression for column, expression in self.derived.items()
+                    if column in self.schema.names or column in checked}
+        sources  = [source for expression in derived.values() for source in expression[1:]]
+        raw      = [self.key] + [column for column in checked if column not in derived] \
+                 + [column for column in self.schema.names if column not in derived] + sources
+
+        return CompiledTransform(spec          = self,
+                                 input_columns = list(dict.fromkeys(raw)),
+                                 constraints   = {column: rule for column, rule in self.constraints.items()
+                                                  if column in self.schema.names},
+                                 derived       = derived,
+                                 date_sources  = list(dict.fromkeys(expression[1] for expression in derived.values()
+                                                                    if expression[0] in TransformSpec.date_parts)))
+
+
+class CompiledTransform:
+
+    '''
+    Vectorized plan compiled from a TransformSpec. The key filters are fused into a single row mask applied once, each
+    source date column is converted once for all of its derived parts, and the output columns are built straight into
+    their output types, so no intermediate copy of the whole table is made.
+    '''
+
+    def __init__(self, spec, input_columns, constraints, derived, date_sources):
+        self.spec           = spec
+        self.schema         = spec.schema
+        self.input_columns  = input_columns
+        self.output_columns = spec.schema.names
+        self.input_filters  = [(spec.key, '!=', value) for value in spec.drop_keys]
+        self.constraints    = constraints
+        self.derived        = derived
+        self.date_sources   = date_sources
+        self.epoch_offset   = (spec.date_epoch - pd.Timestamp('1970-1-1')).days
+
+    def key_mask(self, keys, seen_keys=None):
+        ''' Rows holding the first occurrence of a valid key that is not in seen_keys '''
+        keep = ~pd.isna(keys)
+        if self.spec.drop_keys:
+            keep &= ~np.isin(keys, self.spec.drop_keys)
+        first = np.zeros(len(keys), dtype=bool)
+        first[np.flatnonzero(keep)[np.unique(keys[keep], return_index=True)[1]]] = True
+        if seen_keys is not None and len(seen_keys):
+            first &= ~np.isin(keys, seen_keys)
+        return first
+
+    def pandas_dtype(self, field):
+        if pa.types.is_dictionary(field.type):
+            return 'category'
+        if pa.types.is_integer(field.type) and field.name!=self.spec.key and field.name not in self.derived:
+            return str(field.type).capitalize()
+        return str(field.type)
+
+    def to_pandas(self, data, seen_keys=None):
+        '''
+        Applies the transform to a pandas DataFrame holding the input columns, returning a DataFrame with the output
+        columns. When seen_keys is given the data is treated as one batch of a stream, and a batch left empty is returned
+        as an empty DataFrame.
+        '''
+        keep = self.key_mask(data[self.spec.key].to_numpy(), seen_keys)
+        data = data.loc[keep, self.input_columns]
+        if seen_keys is not None and data.empty:
+            return pd.DataFrame({column: pd.Series(dtype=self.pandas_dtype(self.schema.field(column)))
+                                 for column in self.output_columns})
+
+        na_value = self.spec.na_value
+        columns  = {}
+        for field in self.schema:
+            if field.name in self.derived:
+                continue
+            values = data[field.name]
+            if field.name in self.constraints:
+                rule   = self.constraints[field.name]
+                values = values.astype(float) if pa.types.is_floating(field.type) else values
+                valid  = values.isin(rule[1]) if rule[0]=='isin' else \
+                         TransformSpec.comparisons[rule[0]][0](values.to_numpy(), rule[1])
+                values = values.where(valid)
+            columns[field.name] = values.astype(self.pandas_dtype(field))
+
+        dates = {source: pd.to_timedelta(data[source], unit='D') + self.spec.date_epoch for source in self.date_sources}
+        for column, expression in self.derived.items():
+            if expression[0]=='days_between':
+                start = data[expression[1]].to_numpy(dtype=float)
+                end   = data[expression[2]].to_numpy(dtype=float)
+                valid = ~(np.isnan(start) | np.isnan(end))
+                columns[column] = pd.Series(np.where(valid, np.floor(np.where(valid, end - start, 0)), na_value).astype(int),
+                                            index=data.index)
+            else:
+                columns[column] = getattr(dates[expression[1]].dt, expression[0]).fillna(na_value).astype(int)
+
+        for check in self.spec.checks:
+            values = columns[check[1]] if check[1] in columns else data[check[1]]
+            if check[0]=='constant':
+                assert values.nunique()==1, f"{check[1]} is not constant"
+            else:
+                other = columns[check[2]] if check[2] in columns else data[check[2]]
+                assert (values != other).sum()==0, f"{check[1]} differs from {check[2]}"
+
+        return pd.DataFrame({column: columns[column] for column in self.output_columns}, index=data.index)
+
+    def to_arrow(self, table, seen_keys=None):
+        '''
+        Applies the transform to a pyarrow Table holding the input columns with pyarrow.compute, returning a Table with
+        the output schema. When seen_keys is given the table is treated as one batch of a stream, and a batch left empty
+        is returned as an empty table.
+        '''
+        keep  = self.key_mask(table[self.spec.key].to_numpy(), seen_keys)
+        table = table.select(self.input_columns).filter(pa.array(keep))
+        if seen_keys is not None and table.num_rows==0:
+            return self.schema.empty_table()
+
+        na_value = self.spec.na_value
+        columns  = {}
+        for field in self.schema:
+            if field.name in self.derived:
+                continue
+            value_type = field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+            values     = pc.cast(table[field.name], value_type)
+            if field.name in self.constraints:
+                rule   = self.constraints[field.name]
+                valid  = pc.is_in(values, value_set=pa.array(rule[1], type=value_type)) if rule[0]=='isin' else \
+                         TransformSpec.comparisons[rule[0]][1](values, rule[1])
+                values = pc.if_else(pc.fill_null(valid, False), values, None)
+            columns[field.name] = pc.dictionary_encode(values) if pa.types.is_dictionary(field.type) else values
+
+        dates = {}
+        for source in self.date_sources:
+            days = pc.add(pc.floor(pc.cast(table[source], pa.float64())), self.epoch_offset)
+            dates[source] = pc.cast(pc.cast(days, pa.int32()), pa.date32())
+        for column, expression in self.derived.items():
+            if expression[0]=='days_between':
+                days = pc.subtract(pc.cast(table[expression[2]], pa.float64()), pc.cast(table[expression[1]], pa.float64()))
+                columns[column] = pc.fill_null(pc.cast(pc.floor(days), pa.int64()), na_value)
+            else:
+                columns[column] = pc.fill_null(getattr(pc, expression[0])(dates[expression[1]]), na_value)
+
+        for check in self.spec.checks:
+            values = columns[check[1]] if check[1] in columns else table[check[1]]
+            if check[0]=='constant':
+                assert pc.count_distinct(values).as_py()==1, f"{check[1]} is not constant"
+            else:
+                other = columns[check[2]] if check[2] in columns else table[check[2]]
+                assert pc.all(pc.equal(values, pc.cast(other, values.type))).as_py(), f"{check[1]} differs from {check[2]}"
+
+        return pa.Table.from_arrays([pc.cast(columns[field.name], field.type) for field in self.schema], schema=self.schema)
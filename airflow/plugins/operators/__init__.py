@@ -1,6 +1,7 @@
 from operators.create_schemas_and_tables import SchemaAndTableCreationOperator
 from operators.stage_immigration_dimensions import StageImmigrationDimensionsOperator
 from operators.stage_immigration_data import StageImmigrationDataOperator
+from operators.backfill_immigration_data import BackfillImmigrationDataOperator
 from operators.stage_temperature_data import StageTemperatureDataOperator
 from operators.copy_data import CopyDataOperator
 from operators.copy_dimensions import CopyDimensionsOperator
@@ -11,6 +12,7 @@ __all__ = [
     'SchemaAndTableCreationOperator',
     'StageImmigrationDimensionsOperator',
     'StageImmigrationDataOperator',
+    'BackfillImmigrationDataOperator',
     'StageTemperatureDataOperator',
     'CopyDataOperator',
     'CopyDimensionsOperator',
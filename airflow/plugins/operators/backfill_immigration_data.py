@@ -0,0 +1,100 @@
+from airflow.hooks.S3_hook import S3Hook
+from airflow.utils.decorators import apply_defaults
+from airflow.contrib.hooks.aws_hook import AwsHook
+from airflow.exceptions import AirflowException
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import s3fs
+from operators.stage_immigration_data import StageImmigrationDataOperator
+
+
+class BackfillImmigrationDataOperator(StageImmigrationDataOperator):
+
+    '''
+    Operator to stage a whole range of months of immigration data in a single task, applying exactly the same staging steps as StageImmigrationDataOperator.
+    The AWS credentials, the S3 connections and the imported transforms are shared by every month, which are staged concurrently by a bounded pool of threads.
+
+    - Inputs:
+        * start_month: First month to stage, in the format "YYYY-MM"
+        * end_month: Last month to stage (included), in the format "YYYY-MM"
+        * max_workers: Maximum number of months staged concurrently
+        * Any other argument accepted by StageImmigrationDataOperator, which is applied to every month
+
+    - Outputs: One staged output per month in the range, identical to the output of the monthly StageImmigrationDataOperator runs.
+               When an admnum index is used, months are checked against it in chronological order, so that each month sees the admnums of the months before it
+    '''
+
+    ui_color = '#358140'
+
+    @apply_defaults
+    def __init__(self,
+                 start_month = "",
+                 end_month   = "",
+                 max_workers = 4,
+                 *args,
+                 **kwargs):
+
+        super(BackfillImmigrationDataOperator, self).__init__(*args, **kwargs)
+        self.start_month = start_month
+        self.end_month   = end_month
+        self.max_workers = max_workers
+
+    def months(self):
+
+        year, month         = [int(x) for x in self.start_month.split('-')]
+        end_year, end_month = [int(x) for x in self.end_month.split('-')]
+        months = []
+        while (year, month) <= (end_year, end_month):
+            months.append((f"{year:04d}", f"{month:02d}"))
+            year, month = (year + 1, 1) if month==12 else (year, month + 1)
+        return months
+
+    def execute(self, context):
+
+        self.log.info("Initializing connections")
+        aws_hook = AwsHook(self.aws_credentials_id)
+        s3_hook  = S3Hook (self.aws_credentials_id)
+        fs = s3fs.S3FileSystem(anon   = False,
+                               key    = aws_hook.get_credentials().access_key,
+                               secret = aws_hook.get_credentials().secret_key)
+
+        months = self.months()
+        turns  = [threading.Event() for _ in months]
+        self.log.info(f"Backfilling {len(months)} months with up to {self.max_workers} concurrent months")
+
+        def stage_month_in_turn(index, redshift):
+            year, month = months[index]
+            try:
+                self.stage_month(s3_hook, fs, year, month,
+                                 index_turn = IndexTurn(turns[index - 1] if index else None, turns[index]),
+                                 redshift   = redshift)
+                self.log.info(f"Staged {year}-{month}")
+            finally:
+                turns[index].set()
+
+        with self.index_session() as redshift, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(stage_month_in_turn, index, redshift): months[index] for index in range(len(months))}
+
+        failed_months = []
+        for future, (year, month) in futures.items():
+            if future.exception() is not None:
+                self.log.error(f"Staging of {year}-{month} failed: {future.exception()}")
+                failed_months.append(f"{year}-{month}")
+        if failed_months:
+            raise AirflowException(f"Backfill failed for months {', '.join(failed_months)}")
+
+
+class IndexTurn:
+
+    ''' Context manager waiting for the admnum index of the previous month to be written, and signaling its own once written '''
+
+    def __init__(self, previous_turn, own_turn):
+        self.previous_turn = previous_turn
+        self.own_turn      = own_turn
+
+    def __enter__(self):
+        if self.previous_turn is not None:
+            self.previous_turn.wait()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.own_turn.set()
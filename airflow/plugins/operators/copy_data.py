@@ -1,6 +1,8 @@
 from airflow.hooks.postgres_hook import PostgresHook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from airflow.exceptions import AirflowException
+from helpers import SqlQueries, RedshiftSession
 
 class CopyDataOperator(BaseOperator):
     
@@ -14,6 +16,11 @@ class CopyDataOperator(BaseOperator):
         * copy_satement: Copy statement used to load the data into Redshift
         * input_s3_bucket: Bucket containing the data to be copied into Redshift
         * input_s3_key: Path to the data, which should contain the files in the format produced by the staging operators
+        * manifest: True if the immigration data was staged as part files, in which case the COPY manifest produced by the staging operator is loaded instead of a single file. The temperature data is always loaded through its manifest
+        * temperature_summary: True if the temperature data was staged in the summary mode, in which case the per-country statistics are loaded instead of the cleaned series
+        * load_mode: Either 'full', 'merge' or 'incremental'. The merge mode only applies to the immigration data: the staged month is copied into a session table, and the month of the execution date is deleted from immigration.us_entries and inserted from that table in the same transaction, so that retries and reruns replace the month instead of duplicating it. The incremental mode only applies to the temperature data, which is an append-only series: the load plan pushed by the StageTemperatureDataOperator run staging_task_id is followed, so that either the staged records past the watermark recorded in temperature.load_watermarks are appended, or the whole staged series is reloaded when its history was rewritten, before the watermark and fingerprint of the series are recorded. The load fails if the recorded watermark moved since the increment was staged. copy_statement is not used in these two modes
+        * staging_task_id: Task id of the StageTemperatureDataOperator run upstream, required by the incremental mode
+        * statement_timeout: Optional timeout in milliseconds of each statement run in Redshift
         
     - Output: Updated fact table in Redshift, populated with the corresponding data
     '''
@@ -22,26 +29,46 @@ class CopyDataOperator(BaseOperator):
 
     @apply_defaults
     def __init__(self,
-                 redshift_conn_id   = "",
-                 iam_role           = "",
-                 immigration_data   = False,
-                 copy_statement     = "",
-                 input_s3_bucket    = "",
-                 input_s3_key       = "",
+                 redshift_conn_id    = "",
+                 iam_role            = "",
+                 immigration_data    = False,
+                 copy_statement      = "",
+                 input_s3_bucket     = "",
+                 input_s3_key        = "",
+                 manifest            = False,
+                 temperature_summary = False,
+                 load_mode           = 'full',
+                 statement_timeout   = None,
+                 staging_task_id     = None,
                  *args, **kwargs):
         
         super(CopyDataOperator, self).__init__(*args, **kwargs)
-        self.redshift_conn_id = redshift_conn_id
-        self.iam_role         = iam_role
-        self.immigration_data = immigration_data
-        self.copy_statement   = copy_statement
-        self.input_s3_bucket  = input_s3_bucket
-        self.input_s3_key     = input_s3_key
+        self.redshift_conn_id    = redshift_conn_id
+        self.iam_role            = iam_role
+        self.immigration_data    = immigration_data
+        self.copy_statement      = copy_statement
+        self.input_s3_bucket     = input_s3_bucket
+        self.input_s3_key        = input_s3_key
+        self.manifest            = manifest
+        self.temperature_summary = temperature_summary
+        self.load_mode           = load_mode
+        self.statement_timeout   = statement_timeout
+        self.staging_task_id     = staging_task_id
+        if load_mode not in ('full', 'merge', 'incremental'):
+            raise ValueError(f"Unknown load mode {load_mode}, expected 'full', 'merge' or 'incremental'")
+        if load_mode=='merge' and not immigration_data:
+            raise ValueError("The merge load mode only applies to the immigration data")
+        if load_mode=='incremental' and (immigration_data or temperature_summary):
+            raise ValueError("The incremental load mode only applies to the cleaned temperature series")
+        if load_mode=='incremental' and not staging_task_id:
+            raise ValueError("The incremental load mode needs the staging_task_id publishing the load plan")
         
     def execute(self, context):
         
         self.log.info('Initializing connections')
-        redshift = PostgresHook(postgres_conn_id=self.redshift_conn_id)
+        redshift = RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id),
+                                   max_connections   = 1,
+                                   statement_timeout = self.statement_timeout)
 
         self.log.info('Retrieving name of the file to stage')
         if self.immigration_data:
@@ -50,13 +77,68 @@ class CopyDataOperator(BaseOperator):
                               '04': 'apr', '05': 'may', '06': 'jun',
                               '07': 'jul', '08': 'aug', '09': 'sep',
                               '10': 'oct', '11': 'nov', '12': 'dec'}[month]
-            path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/i94_{month_alphanum}{year[2:]}_sub.parquet"
+            if self.manifest:
+                path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/i94_{month_alphanum}{year[2:]}_sub.manifest"
+            else:
+                path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/i94_{month_alphanum}{year[2:]}_sub.parquet"
+        elif self.temperature_summary:
+            path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/temperatureStats.manifest"
         else:
-            path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/cleanTemperatureData.csv"
+            path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/cleanTemperatureData.manifest"
                             
             
-        self.log.info("Inserting records")
-        formatted_sql = self.copy_statement.format(
-            path_to_file,
-            self.iam_role)
-        redshift.run(formatted_sql)
+        with redshift:
+            if self.load_mode=='merge':
+                self.merge_month(redshift, path_to_file, int(year), int(month))
+                return
+            if self.load_mode=='incremental':
+                plan = context['task_instance'].xcom_pull(task_ids=self.staging_task_id, key='temperature_load')
+                if plan is None:
+                    raise AirflowException(f"No temperature load plan was pushed by {self.staging_task_id}")
+                self.load_increment(redshift, path_to_file, plan)
+                return
+                
+            self.log.info("Inserting records")
+            formatted_sql = self.copy_statement.format(
+                path_to_file,
+                self.iam_role)
+            redshift.run(formatted_sql)
+        
+    def merge_month(self, redshift, path_to_file, year, month):
+        
+        stage_statement = SqlQueries.stage_immigration_month_from_manifest if self.manifest else SqlQueries.stage_immigration_month
+        with redshift.transaction() as cursor:
+            self.log.info("Copying the staged month into a session table")
+            cursor.execute(stage_statement.format(path_to_file, self.iam_role))
+            
+            self.log.info(f"Replacing the records of {year}-{month:02d}")
+            cursor.execute(SqlQueries.merge_immigration_month.format(year, month))
+            self.log.info(f"{cursor.rowcount} records inserted")
+            cursor.execute(SqlQueries.drop_staged_immigration_month)
+        
+    def load_increment(self, redshift, path_to_file, plan):
+        
+        with redshift.transaction() as cursor:
+            cursor.execute(SqlQueries.lock_temperature_data)
+            cursor.execute(SqlQueries.temperature_watermark)
+            stored = cursor.fetchone()
+            watermark = str(stored[0]) if stored is not None and stored[0] is not None else None
+            
+            if stored is not None and stored[3]==plan['source_fingerprint']:
+                self.log.info(f"Temperatures already loaded from the staged series up to {watermark}, nothing to load")
+                return
+            if plan['mode']!='reload' and watermark!=plan['watermark']:
+                raise AirflowException(f"Watermark moved from {plan['watermark']} to {watermark} since the temperatures were staged")
+            
+            if plan['mode']=='append':
+                self.log.info(f"Appending {plan['staged_rows']} staged records past the watermark {watermark}")
+                if plan['staged_rows']:
+                    cursor.execute(SqlQueries.append_temperature_increment.format(watermark, path_to_file, self.iam_role))
+            else:
+                self.log.info(f"Reloading the whole series of {plan['staged_rows']} staged records")
+                cursor.execute(SqlQueries.reload_temperature_data.format(path_to_file, self.iam_role))
+            
+            cursor.execute(SqlQueries.record_temperature_watermark, (plan['new_watermark'],
+                                                                     plan['history_rows'],
+                                                                     plan['history_checksum'],
+                                                                     plan['source_fingerprint']))
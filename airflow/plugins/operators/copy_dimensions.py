@@ -1,21 +1,33 @@
 from airflow.hooks.postgres_hook import PostgresHook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from airflow.exceptions import AirflowException
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_values
+from helpers import SasLabels, SqlQueries, RedshiftSession
 
 class CopyDimensionsOperator(BaseOperator):
     
     ''' 
-    Operator to copy into Redshift the staged dimensions data for the immigration schema.
+    Operator to copy into Redshift the staged dimensions data for the immigration schema, or to insert the dimensions straight from the SAS labels file when they are small.
     
     - Inputs:
         * redshift_conn_id: connection id defined from Airflow's UI
         * iam_role: IAM role defined in order to copy the data from S3 to Redshift
         * dimensions: List of tables to be copied into Redshift
-        * truncate: Truncate the destination tables in Redshift if True
+        * truncate: Empty the destination tables in Redshift before copying if True
         * input_s3_bucket: Bucket containing the staged data to be uploaded
         * input_s3_key: Path to the data, which should contain the files in the format produced by the staging operators
+        * staging_task_id: Task id of the StageImmigrationDimensionsOperator run upstream. If defined, only the dimensions listed in its "changed_dimensions" XCom are copied, and their content hashes are recorded in immigration.dimension_versions. Otherwise every dimension is copied and its recorded hash cleared
+        * load_mode: Either 'copy' or 'insert'. The insert mode parses the dimensions from the SAS labels file and, if they hold at most insert_threshold rows in total, writes them through batched multi-row INSERT statements over a single connection and transaction, without going through S3. Dimensions whose content hash matches the one recorded in immigration.dimension_versions are skipped. Above the threshold, the staged files are copied as in the copy mode, which fails if no input_s3_bucket is defined
+        * insert_threshold: Maximum number of rows across the dimensions loaded through INSERT statements
+        * page_size: Number of rows per INSERT statement in the insert mode
+        * labels_path: Path to the SAS labels file on the worker, required in the insert mode
+        * labels_cache_dir: Directory where the parsed labels are cached, defaulting to a private directory under AIRFLOW_HOME
+        * max_workers: Maximum number of tables copied concurrently in the copy mode, each one over its own connection
+        * statement_timeout: Optional timeout in milliseconds of each statement run in Redshift
         
-    - Outputs: Populated dimensions tables in Redshift
+    - Outputs: Populated dimensions tables in Redshift. In the copy mode the tables are copied concurrently, each one emptied and copied in its own transaction, and the versions of the tables loaded are recorded once every copy has finished. The operator fails listing every table whose copy failed. In the insert mode every table is replaced in a single transaction
         
     '''
 
@@ -23,47 +35,143 @@ class CopyDimensionsOperator(BaseOperator):
     
     base_copy_statement = """
         COPY immigration.{} FROM '{}' IGNOREHEADER AS 1 DELIMITER ';' IAM_ROLE '{}';
-        COMMIT;
         """
     
     truncate_statement = """
-        TRUNCATE TABLE immigration.{};
+        LOCK immigration.{0};
+        DELETE FROM immigration.{0};
         """
 
     @apply_defaults
     def __init__(self,
-                 redshift_conn_id = "",
-                 iam_role         = "",
-                 dimensions       = [],
-                 truncate         = True,
-                 input_s3_bucket  = "",
-                 input_s3_key     = "",
+                 redshift_conn_id  = "",
+                 iam_role          = "",
+                 dimensions        = [],
+                 truncate          = True,
+                 input_s3_bucket   = "",
+                 input_s3_key      = "",
+                 staging_task_id   = None,
+                 load_mode         = 'copy',
+                 insert_threshold  = 10000,
+                 page_size         = 1000,
+                 labels_path       = None,
+                 labels_cache_dir  = None,
+                 max_workers       = 5,
+                 statement_timeout = None,
                  *args, **kwargs):
         
         super(CopyDimensionsOperator, self).__init__(*args, **kwargs)
-        self.redshift_conn_id = redshift_conn_id
-        self.iam_role         = iam_role
-        self.dimensions       = dimensions
-        self.truncate         = truncate
-        self.input_s3_bucket  = input_s3_bucket
-        self.input_s3_key     = input_s3_key
+        self.redshift_conn_id  = redshift_conn_id
+        self.iam_role          = iam_role
+        self.dimensions        = dimensions
+        self.truncate          = truncate
+        self.input_s3_bucket   = input_s3_bucket
+        self.input_s3_key      = input_s3_key
+        self.staging_task_id   = staging_task_id
+        self.load_mode         = load_mode
+        self.insert_threshold  = insert_threshold
+        self.page_size         = page_size
+        self.labels_path       = labels_path
+        self.labels_cache_dir  = labels_cache_dir
+        self.max_workers       = max_workers
+        self.statement_timeout = statement_timeout
+        if load_mode not in ('copy', 'insert'):
+            raise ValueError(f"Unknown load mode {load_mode}, expected 'copy' or 'insert'")
+        if load_mode=='insert' and not labels_path:
+            raise ValueError("The insert load mode needs the labels_path of the SAS labels file")
         
     def execute(self, context):
         
         self.log.info('Initializing connections')
-        redshift = PostgresHook(postgres_conn_id=self.redshift_conn_id)
-
-        for dimension in self.dimensions:
+        with RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id),
+                             max_connections   = self.max_workers,
+                             statement_timeout = self.statement_timeout) as redshift:
+            
+            if self.load_mode=='insert':
+                dimensions = SasLabels.load(self.labels_path, self.labels_cache_dir)
+                rows       = sum(len(dimensions[dimension]) for dimension in self.dimensions)
+                if rows <= self.insert_threshold:
+                    self.insert_dimensions(redshift, dimensions)
+                    return
+                if not self.input_s3_bucket:
+                    raise AirflowException(f"{rows} dimension rows above the insert threshold of {self.insert_threshold}, "
+                                           "but no input_s3_bucket holding staged dimensions to copy them from. Stage "
+                                           "the dimensions with StageImmigrationDimensionsOperator and set input_s3_bucket, "
+                                           "input_s3_key and staging_task_id, or raise insert_threshold")
+                self.log.info(f"{rows} dimension rows above the insert threshold of {self.insert_threshold}, copying the staged files")
+            
+            if self.staging_task_id:
+                changed_dimensions = context['task_instance'].xcom_pull(task_ids = self.staging_task_id,
+                                                                        key      = 'changed_dimensions') or {}
+            else:
+                changed_dimensions = {dimension: None for dimension in self.dimensions}
+            
+            dimensions = [dimension for dimension in self.dimensions if dimension in changed_dimensions]
+            for dimension in self.dimensions:
+                if dimension not in changed_dimensions:
+                    self.log.info(f"{dimension} already loaded with the same content, skipping copy")
+            if not dimensions:
+                return
             
-            path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/{dimension}.csv"
+            # Versions are cleared before and recorded after the concurrent copies, from a single session, so that the
+            # copies never write to immigration.dimension_versions concurrently
+            redshift.run_many([SqlQueries.clear_dimension_version.format(dimension) for dimension in dimensions])
             
+            self.log.info(f"Copying {len(dimensions)} dimensions with up to {self.max_workers} concurrent tables")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.copy_dimension, redshift, dimension): dimension for dimension in dimensions}
+            
+            failed_dimensions = []
+            for future, dimension in futures.items():
+                if future.exception() is not None:
+                    self.log.error(f"Copy of {dimension} failed: {future.exception()}")
+                    failed_dimensions.append(dimension)
+            
+            loaded_versions = [SqlQueries.record_dimension_version.format(dimension, changed_dimensions[dimension])
+                               for dimension in dimensions
+                               if dimension not in failed_dimensions and changed_dimensions[dimension]]
+            if loaded_versions:
+                redshift.run_many(loaded_versions)
+            if failed_dimensions:
+                raise AirflowException(f"Copy failed for dimensions {', '.join(failed_dimensions)}")
+    
+    def copy_dimension(self, redshift, dimension):
+        
+        path_to_file = f"s3://{self.input_s3_bucket}/{self.input_s3_key}/{dimension}.csv"
+        
+        with redshift.transaction() as cursor:
             if self.truncate:
                 self.log.info(f"Truncating {dimension}")
-                CopyDimensionsOperator.truncate_statement.format(dimension)
+                cursor.execute(CopyDimensionsOperator.truncate_statement.format(dimension))
                 
             self.log.info(f"Copying into {dimension}")
             formatted_sql = CopyDimensionsOperator.base_copy_statement.format(
                 dimension,
                 path_to_file,
                 self.iam_role)
-            redshift.run(formatted_sql)
+            cursor.execute(formatted_sql)
+    
+    def insert_dimensions(self, redshift, dimensions):
+        
+        with redshift.transaction() as cursor:
+            cursor.execute(SqlQueries.dimension_versions)
+            loaded_versions = dict(cursor.fetchall())
+            
+            for dimension in self.dimensions:
+                
+                records      = dimensions[dimension]
+                content_hash = SasLabels.content_hash(records)
+                if loaded_versions.get(dimension)==content_hash:
+                    self.log.info(f"{dimension} already loaded with the same content, skipping insert")
+                    continue
+                
+                if self.truncate:
+                    self.log.info(f"Truncating {dimension}")
+                    cursor.execute(CopyDimensionsOperator.truncate_statement.format(dimension))
+                
+                self.log.info(f"Inserting {len(records)} records into {dimension}")
+                execute_values(cursor,
+                               f"INSERT INTO immigration.{dimension} VALUES %s",
+                               [(str(code), name) for code, name in records.items()],
+                               page_size = self.page_size)
+                cursor.execute(SqlQueries.record_dimension_version.format(dimension, content_hash))
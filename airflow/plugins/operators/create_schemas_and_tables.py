@@ -1,6 +1,7 @@
 from airflow.hooks.postgres_hook import PostgresHook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from helpers import RedshiftSession
 
 class SchemaAndTableCreationOperator(BaseOperator):
         
@@ -11,6 +12,7 @@ class SchemaAndTableCreationOperator(BaseOperator):
         * redshift_conn_id: connection id defined from Airflow's UI
         * create_schemas_sql: SQL statement used to create the schemas in the data model
         * create_tables_sql: SQL statement used to create the tables in the data model
+        * statement_timeout: Optional timeout in milliseconds of each statement run in Redshift
         
     - Outputs: Schemas and tables created in the Redshift cluster
     '''
@@ -22,6 +24,7 @@ class SchemaAndTableCreationOperator(BaseOperator):
                  redshift_conn_id   = "",
                  create_schemas_sql = "",
                  create_tables_sql  = "",
+                 statement_timeout  = None,
                  *args, 
                  **kwargs):
 
@@ -29,15 +32,17 @@ class SchemaAndTableCreationOperator(BaseOperator):
         self.redshift_conn_id   = redshift_conn_id
         self.create_schemas_sql = create_schemas_sql
         self.create_tables_sql  = create_tables_sql
+        self.statement_timeout  = statement_timeout
         
     def execute(self, context):
         
         self.log.info("Initializing connections")
-        redshift = PostgresHook(postgres_conn_id=self.redshift_conn_id)
+        with RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id),
+                             statement_timeout=self.statement_timeout) as redshift:
         
-        self.log.info("Creating schemas if currently not existing")
-        redshift.run(self.create_schemas_sql)
-        
-        self.log.info("Creating tables if currently not existing")
-        redshift.run(self.create_tables_sql)
+            self.log.info("Creating schemas if currently not existing")
+            redshift.run(self.create_schemas_sql)
+            
+            self.log.info("Creating tables if currently not existing")
+            redshift.run(self.create_tables_sql)
         
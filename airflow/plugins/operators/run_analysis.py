@@ -3,6 +3,7 @@ from airflow.hooks.S3_hook import S3Hook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
 from airflow.contrib.hooks.aws_hook import AwsHook
+from helpers import RedshiftSession
 
 class RunAnalysisOperator(BaseOperator):
         
@@ -12,6 +13,7 @@ class RunAnalysisOperator(BaseOperator):
     - Inputs:
         * redshift_conn_id: Connection id defined from Airflow's UI
         * sql_statement: Statement to generate the desired analysis. This should be a formatted string allowing four arguments as shown below, for correct output versioning
+        * statement_timeout: Optional timeout in milliseconds of the statement run in Redshift
         
     - Outputs: Redshift table containing the results of the specific analysis run
     '''
@@ -20,19 +22,22 @@ class RunAnalysisOperator(BaseOperator):
 
     @apply_defaults
     def __init__(self,
-                 redshift_conn_id = "",
-                 sql_statement    = "",
+                 redshift_conn_id  = "",
+                 sql_statement     = "",
+                 statement_timeout = None,
                  *args, 
                  **kwargs):
 
         super(RunAnalysisOperator, self).__init__(*args, **kwargs)
         self.redshift_conn_id  = redshift_conn_id
         self.sql_statement     = sql_statement
+        self.statement_timeout = statement_timeout
 
     def execute(self, context):
         
         self.log.info('Initializing connections')
-        redshift = PostgresHook(postgres_conn_id=self.redshift_conn_id)
+        redshift = RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id),
+                                   statement_timeout=self.statement_timeout)
         
         year, month, day = context['ds'].split('-')
         month_alphanum = {'01': 'jan', '02': 'feb', '03': 'mar',
@@ -47,5 +52,6 @@ class RunAnalysisOperator(BaseOperator):
             int(year),
             int(month),
             int(year))
-        redshift.run(formatted_sql)
+        with redshift:
+            redshift.run(formatted_sql)
         
\ No newline at end of file
@@ -1,6 +1,7 @@
 from airflow.hooks.postgres_hook import PostgresHook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from helpers import RedshiftSession
 
 
 class RunQualityCheckOperator(BaseOperator):
@@ -12,6 +13,7 @@ class RunQualityCheckOperator(BaseOperator):
         * redshift_conn_id: Connection id defined from Airflow's UI
         * test_tables: Redshift tables to be tested
         * dq_checks: List of data quality checks to be run, where each data quality check is a dictionary with the keys 'check_sql' (SQL code to obtain desired outputs) and 'success_condition' (logical statement representing expected output
+        * statement_timeout: Optional timeout in milliseconds of each check run in Redshift. Every check runs over the same connection
         
     - Outputs: Logged results for the data quality checks, with the operator raising an exception if any of the tests is not passed
     '''
@@ -20,34 +22,38 @@ class RunQualityCheckOperator(BaseOperator):
 
     @apply_defaults
     def __init__(self,
-                 redshift_conn_id = "",
-                 test_tables      = {}, 
-                 dq_checks        = [],
+                 redshift_conn_id  = "",
+                 test_tables       = {}, 
+                 dq_checks         = [],
+                 statement_timeout = None,
                  *args, **kwargs):
 
         super(RunQualityCheckOperator, self).__init__(*args, **kwargs)
-        self.redshift_conn_id = redshift_conn_id
-        self.test_tables      = test_tables
-        self.dq_checks        = dq_checks
+        self.redshift_conn_id  = redshift_conn_id
+        self.test_tables       = test_tables
+        self.dq_checks         = dq_checks
+        self.statement_timeout = statement_timeout
 
         
     def execute(self, context):
         
         self.log.info('Initializing connections')
-        redshift = PostgresHook(postgres_conn_id=self.redshift_conn_id)
-        
-        self.log.info('Running battery of tests for each table')
-        failed_tests = 0
-        for test_table in self.test_tables:
-            for dq_check in self.dq_checks:
-                check_sql         = dq_check['check_sql']
-                success_condition = dq_check['success_condition']
-                result            = redshift.get_records(check_sql.format(test_table))[0][0]
-                if not eval(success_condition.format(result)): 
-                    failed_tests += 1
-                    self.log.info(f'Failed test with SQL {check_sql} for table {test_table}')
-                else:
-                    self.log.info('All tests met the defined success criteria')
+        with RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id),
+                             max_connections   = 1,
+                             statement_timeout = self.statement_timeout) as redshift:
+        
+            self.log.info('Running battery of tests for each table')
+            failed_tests = 0
+            for test_table in self.test_tables:
+                for dq_check in self.dq_checks:
+                    check_sql         = dq_check['check_sql']
+                    success_condition = dq_check['success_condition']
+                    result            = redshift.get_records(check_sql.format(test_table))[0][0]
+                    if not eval(success_condition.format(result)): 
+                        failed_tests += 1
+                        self.log.info(f'Failed test with SQL {check_sql} for table {test_table}')
+                    else:
+                        self.log.info('All tests met the defined success criteria')
         
         
         
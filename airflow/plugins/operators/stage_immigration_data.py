@@ -3,10 +3,19 @@ from airflow.hooks.S3_hook import S3Hook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
 from airflow.contrib.hooks.aws_hook import AwsHook
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import numpy as np
+import pyarrow as pa
 import pyarrow.parquet as pq
 import s3fs
-import numpy as np
+from helpers import (TransformSpec, ImmigrationTransforms, SasLabels, DimensionLookup, StagedParts,
+                     SpooledS3Upload, AdmnumIndex, StagingCache, RedshiftSession)
 
 
 class StageImmigrationDataOperator(BaseOperator):
@@ -20,8 +29,25 @@ class StageImmigrationDataOperator(BaseOperator):
         * input_s3_key: Path to the raw data, where input files while have the naming convention "i94_{month_alphanum}{year[2:]}_sub.parquet", as defined by Airflow's {ds} execution variable
         * output_s3_bucket: Bucket where the staging data will be stored
         * output_s3_key: Path to the staged output data
+        * streaming: If True, the raw file is read and staged batch by batch through an incremental parquet writer instead of being loaded fully into memory
+        * batch_size: Maximum number of rows held in memory per batch when streaming, which caps the peak memory of the task
+        * engine: Either 'pandas' or 'arrow'. The arrow engine applies the same transforms with pyarrow.compute and stays columnar from read to write
+        * parallel: If True, the raw row groups are split across a pool of processes, each one writing its own staged part file, before a final global admnum de-duplication pass merges the parts
+        * workers: Number of processes used when staging in parallel, defaulting to the number of available cores
+        * cluster_slices: Number of slices in the Redshift cluster. If defined, the staged data is split into cluster_slices * parts_per_slice similarly sized part files listed in a COPY manifest
+        * parts_per_slice: Number of part files staged per Redshift slice
+        * admnum_index_s3_key: Path within the output bucket to the persistent index of admnums loaded in every month. If defined, records whose admnum was already staged in another month are dropped, and the index of the current month is updated
+        * redshift_conn_id: connection id defined from Airflow's UI, required with the admnum index. The index step of every month holds a lock on immigration.admnum_index_lock, so that concurrent runs of any DAG never read and update the index at the same time
+        * admnum_index_bloom: If True, each month of the admnum index is checked through its Bloom filter first, and its sorted array is only downloaded to confirm the hits, instead of being searched directly
+        * denormalized_s3_key: Path within the output bucket where a denormalized copy of the staged data is written. If defined, the name of every coded column is decoded through array lookups and appended to the staged columns, so the copy needs no joins downstream
+        * labels_path: Path to the SAS labels file on the worker, required with denormalized_s3_key to decode the coded columns
+        * labels_cache_dir: Directory where the parsed labels are cached, defaulting to a private directory under AIRFLOW_HOME
+        * use_cache: If True, staging is skipped when the raw object, the transform code and the output parameters are unchanged since the last run, based on a fingerprint manifest "i94_{month_alphanum}{year[2:]}_sub.cache.json" stored next to the staged output
+        * spool_threshold: Maximum size in bytes of a staged output held in memory before it is spooled to a private temporary file. Outputs are uploaded from these buffers, never from the current working directory
         
-    - Outputs: Parquet file with the monthly data corresponding to the selected execution, where file created will follow naming convention "i94_{month_alphanum}{year[2:]}_sub.parquet", as defined by Airflow's {ds} execution variable
+    - Outputs: Parquet file with the monthly data corresponding to the selected execution, where file created will follow naming convention "i94_{month_alphanum}{year[2:]}_sub.parquet", as defined by Airflow's {ds} execution variable.
+               When cluster_slices is defined, part files "i94_{month_alphanum}{year[2:]}_sub/part-{index}.parquet" plus the COPY manifest "i94_{month_alphanum}{year[2:]}_sub.manifest" are staged instead.
+               When denormalized_s3_key is defined, the denormalized copy is written to "{denormalized_s3_key}/i94_{month_alphanum}{year[2:]}_sub.parquet"
     '''
     
     ui_color = '#358140'
@@ -33,98 +59,250 @@ class StageImmigrationDataOperator(BaseOperator):
                  input_s3_key        = "",
                  output_s3_bucket    = "",
                  output_s3_key       = "",
+                 streaming           = False,
+                 batch_size          = 500000,
+                 engine              = 'pandas',
+                 parallel            = False,
+                 workers             = None,
+                 cluster_slices      = None,
+                 parts_per_slice     = 1,
+                 admnum_index_s3_key = None,
+                 admnum_index_bloom  = True,
+                 redshift_conn_id    = None,
+                 denormalized_s3_key = None,
+                 labels_path         = None,
+                 labels_cache_dir    = None,
+                 use_cache           = True,
+                 spool_threshold     = SpooledS3Upload.default_spool_threshold,
                  *args, 
                  **kwargs):
 
         super(StageImmigrationDataOperator, self).__init__(*args, **kwargs)
+        if engine not in ('pandas', 'arrow'):
+            raise ValueError(f"Unknown staging engine {engine}, expected 'pandas' or 'arrow'")
+        if admnum_index_s3_key and not redshift_conn_id:
+            raise ValueError("The admnum index needs a redshift_conn_id to lock it, as it is shared by every run and DAG staging immigration data")
+        if denormalized_s3_key and not labels_path:
+            raise ValueError("The denormalized output needs the labels_path of the SAS labels file")
         self.aws_credentials_id  = aws_credentials_id
         self.input_s3_bucket     = input_s3_bucket
         self.input_s3_key        = input_s3_key
         self.output_s3_bucket    = output_s3_bucket
         self.output_s3_key       = output_s3_key
+        self.streaming           = streaming
+        self.batch_size          = batch_size
+        self.engine              = engine
+        self.parallel            = parallel
+        self.workers             = workers or os.cpu_count()
+        self.cluster_slices      = cluster_slices
+        self.parts_per_slice     = parts_per_slice
+        self.admnum_index_s3_key = admnum_index_s3_key
+        self.admnum_index_bloom  = admnum_index_bloom
+        self.redshift_conn_id    = redshift_conn_id
+        self.denormalized_s3_key = denormalized_s3_key
+        self.labels_path         = labels_path
+        self.labels_cache_dir    = labels_cache_dir
+        self.use_cache           = use_cache
+        self.spool_threshold     = spool_threshold
 
     def execute(self, context):
         
         self.log.info("Initializing connections")
         aws_hook = AwsHook(self.aws_credentials_id)
         s3_hook  = S3Hook (self.aws_credentials_id)
+        fs = s3fs.S3FileSystem(anon   = False, 
+                               key    = aws_hook.get_credentials().access_key, 
+                               secret = aws_hook.get_credentials().secret_key)
+        
         year, month, day = context['ds'].split('-')
+        with self.index_session() as redshift:
+            self.stage_month(s3_hook, fs, year, month, redshift=redshift)
+
+    def labels_digest(self):
+        with open(self.labels_path, 'rb') as labels_file:
+            return hashlib.sha256(labels_file.read()).hexdigest()
+
+    def index_session(self):
+        if self.admnum_index_s3_key:
+            return RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id), max_connections=1)
+        return contextlib.nullcontext()
+
+    def stage_month(self, s3_hook, fs, year, month, index_turn=None, redshift=None):
+        
         month_alphanum = {'01': 'jan', '02': 'feb', '03': 'mar',
                           '04': 'apr', '05': 'may', '06': 'jun',
                           '07': 'jul', '08': 'aug', '09': 'sep',
                           '10': 'oct', '11': 'nov', '12': 'dec'}[month]
         path_to_file = f"{self.input_s3_bucket}/{self.input_s3_key}/i94_{month_alphanum}{year[2:]}_sub.parquet"
+        staged_name  = f"i94_{month_alphanum}{year[2:]}_sub"
+
+        if self.use_cache:
+            cache       = StagingCache(s3_hook, self.output_s3_bucket, f"{self.output_s3_key}/{staged_name}.cache.json")
+            fingerprint = cache.fingerprint(source_bucket = self.input_s3_bucket,
+                                            source_key    = f"{self.input_s3_key}/{staged_name}.parquet",
+                                            code_version  = StagingCache.code_version(TransformSpec, ImmigrationTransforms, SasLabels, DimensionLookup,
+                                                                                      StagedParts, AdmnumIndex, SpooledS3Upload,
+                                                                                      StageImmigrationDataOperator),
+                                            parameters    = {'cluster_slices'     : self.cluster_slices,
+                                                             'parts_per_slice'    : self.parts_per_slice,
+                                                             'admnum_index_s3_key': self.admnum_index_s3_key,
+                                                             'denormalized_s3_key': self.denormalized_s3_key,
+                                                             'labels_digest'      : self.labels_digest() if self.denormalized_s3_key else None})
+            if cache.is_fresh(fingerprint):
+                self.log.info("Raw data and staging code unchanged since the last run, skipping staging")
+                return
+
+        staged_file = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        try:
+            self.stage(fs, path_to_file, staged_file)
+            staged_file.seek(0)
+
+            if self.admnum_index_s3_key:
+                with index_turn or contextlib.nullcontext(), \
+                     redshift.table_lock('immigration.admnum_index_lock') if redshift else contextlib.nullcontext():
+                    staged_file = self.drop_loaded_admnums(s3_hook, AdmnumIndex.month_name(year, month), staged_file)
+
+            if self.cluster_slices:
+                self.log.info("Copying part files and COPY manifest to staging path")
+                staged_keys = self.upload_parts(s3_hook, staged_file, staged_name)
+            else:
+                self.log.info("Copying file to staging path")
+                staged_keys = [f"{self.output_s3_key}/{staged_name}.parquet"]
+                s3_hook.load_file_obj(staged_file,
+                                      key         = staged_keys[0],
+                                      bucket_name = self.output_s3_bucket,
+                                      replace     = True)
+
+            if self.denormalized_s3_key:
+                self.log.info("Copying denormalized data to its staging path")
+                staged_file.seek(0)
+                staged_keys.append(self.upload_denormalized(s3_hook, staged_file, staged_name))
+        finally:
+            staged_file.close()
+
+        if self.use_cache:
+            cache.record(fingerprint, staged_keys)
+
+    def stage(self, fs, path_to_file, staged_file):
         
-        self.log.info(f"Loading to memory the file corresponding to the execution date: {path_to_file}")
-        fs = s3fs.S3FileSystem(anon   = False, 
-                               key    = aws_hook.get_credentials().access_key, 
-                               secret = aws_hook.get_credentials().secret_key)
-        data = pq.ParquetDataset(path_to_file, filesystem = fs).read().to_pandas()
-        
-        self.log.info("Recasting data types")
-        data.i94yr = data.i94yr.astype(int)
-        data.i94mon = data.i94mon.astype(int)
+        if self.parallel:
+            self.log.info(f"Staging the file corresponding to the execution date with {self.workers} processes: {path_to_file}")
+            self.stage_in_parallel(fs, path_to_file, staged_file)
+        elif self.streaming:
+            self.log.info(f"Streaming the file corresponding to the execution date in batches of {self.batch_size} rows: {path_to_file}")
+            with fs.open(path_to_file, 'rb') as raw_file:
+                parquet_file = pq.ParquetFile(raw_file)
+                row_groups   = ImmigrationTransforms.valid_row_groups(parquet_file)
+                self.log.info(f"Reading {len(row_groups)} out of {parquet_file.num_row_groups} row groups")
+                batches      = parquet_file.iter_batches(batch_size = self.batch_size,
+                                                         row_groups = row_groups,
+                                                         columns    = ImmigrationTransforms.input_columns)
+                with pq.ParquetWriter(staged_file, ImmigrationTransforms.output_schema) as writer:
+                    for staged_batch in ImmigrationTransforms.stage_batches(batches, engine=self.engine):
+                        writer.write_table(staged_batch)
+        else:
+            self.log.info(f"Loading to memory the file corresponding to the execution date: {path_to_file}")
+            table = pq.read_table(path_to_file,
+                                  filesystem = fs,
+                                  columns    = ImmigrationTransforms.input_columns,
+                                  filters    = ImmigrationTransforms.input_filters)
+
+            self.log.info(f"Applying the vectorized staging transforms with the {self.engine} engine")
+            if self.engine=='arrow':
+                pq.write_table(ImmigrationTransforms.stage_arrow(table), staged_file)
+            else:
+                pq.write_table(pa.Table.from_pandas(ImmigrationTransforms.stage(table.to_pandas()),
+                                                    schema         = ImmigrationTransforms.output_schema,
+                                                    preserve_index = False),
+                               staged_file)
+
+    def drop_loaded_admnums(self, s3_hook, month_name, staged_file):
         
-        data.i94cit = data.i94cit.astype(str)
-        data.i94res = data.i94res.astype(str)
-        data.i94visa = data.i94visa.astype(str)
-        data.i94mode = data.i94mode.astype(str)
+        index        = AdmnumIndex(s3_hook, self.output_s3_bucket, self.admnum_index_s3_key, use_bloom=self.admnum_index_bloom)
+        parquet_file = pq.ParquetFile(staged_file)
+        admnums      = parquet_file.read(columns=['admnum'])['admnum'].to_numpy()
+        loaded       = index.loaded_mask(admnums, exclude_month=month_name)
         
-        data.i94bir = data.i94bir.astype(float)
-
-        self.log.info("Cleaning invalid admnum records")
-        data = data[data['admnum']!=0]
-        data = data[data.duplicated(subset=['admnum'])==False]
-        data.admnum = data.admnum.astype(int)
-
-        self.log.info("Ensuring correctness for the data level")
-        assert data.i94yr.nunique()==1
-        assert data.i94mon.nunique()==1
-
-        self.log.info("Cleaning inconsistent age and gender info")
-        data.i94bir = data.i94bir.apply(lambda x: x if x>=0 else np.nan)
-        data.gender = data.gender.apply(lambda x: x if x in ['M', 'F', 'X', 'U'] else np.nan)
-
-        self.log.info("Transformation of date formats and ensuring the extraction segment is consistent with arrival dates")
-        data.arrdate = pd.to_timedelta(data.arrdate, unit='D') + pd.Timestamp('1960-1-1')
-        data['arrival_day']   = data.arrdate.apply(lambda x: x.day)
-        data['arrival_month'] = data.arrdate.apply(lambda x: x.month)
-        data['arrival_year']  = data.arrdate.apply(lambda x: x.year)
-        assert (data['arrival_month'] != data['i94mon']).sum()==0
-        assert (data['arrival_year']  != data['i94yr']) .sum()==0
-
-        self.log.info("Transformations to departure dates")
-        data.depdate = pd.to_timedelta(data.depdate, unit='D') + pd.Timestamp('1960-1-1')
-        data['departure_day']   = data.depdate.apply(lambda x: x.day)
-        data['departure_month'] = data.depdate.apply(lambda x: x.month)
-        data['departure_year']  = data.depdate.apply(lambda x: x.year)
-
-        self.log.info("Computing length of stays")
-        data['length_of_stay'] = (data.depdate - data.arrdate).apply(lambda x: x.days)
+        self.log.info(f"Dropping {loaded.sum()} records whose admnum was already loaded in a previous month")
+        index.save_month(month_name, admnums[~loaded])
+        if not loaded.any():
+            staged_file.seek(0)
+            return staged_file
         
-        self.log.info("Recasting date values and length of stay")
-        for column in ['arrival_day', 'arrival_month', 'arrival_year',
-                       'departure_day', 'departure_month', 'departure_year',
-                       'length_of_stay']:
-            data[column] = data[column].fillna(-9999).astype(int)
-
-        self.log.info("Copying file to staging path")
-        data = data[['admnum',
-                     'i94bir', 'gender', 'i94visa',
-                     'i94cit', 'i94res', 'i94addr', 
-                     'i94mode',
-                     'arrival_day',   'arrival_month',   'arrival_year', 
-                     'departure_day', 'departure_month', 'departure_year', 'length_of_stay']]
-
-        data.to_parquet(f"i94_{month_alphanum}{year[2:]}_sub.parquet", index=False)
-        s3_hook.load_file(filename    = f"i94_{month_alphanum}{year[2:]}_sub.parquet",
-                          key         = f"{self.output_s3_key}/i94_{month_alphanum}{year[2:]}_sub.parquet",
-                          bucket_name = self.output_s3_bucket,
-                          replace     = True)
-                      
+        filtered_file = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        offset = 0
+        with pq.ParquetWriter(filtered_file, ImmigrationTransforms.output_schema) as writer:
+            for batch in parquet_file.iter_batches():
+                keep    = ~loaded[offset:offset + batch.num_rows]
+                offset += batch.num_rows
+                writer.write_table(pa.Table.from_batches([batch]).filter(pa.array(keep)).cast(ImmigrationTransforms.output_schema))
+        staged_file.close()
+        filtered_file.seek(0)
+        return filtered_file
+
+    def upload_parts(self, s3_hook, staged_file, staged_name):
         
-                      
+        entries = []
+        for index, part_tables in enumerate(StagedParts.iter_parts(staged_file, self.cluster_slices * self.parts_per_slice)):
+            key = f"{self.output_s3_key}/{staged_name}/part-{index:05d}.parquet"
+            upload = SpooledS3Upload(s3_hook, self.output_s3_bucket, key, self.spool_threshold)
+            with upload as part_file:
+                with pq.ParquetWriter(part_file, ImmigrationTransforms.output_schema) as writer:
+                    for part_table in part_tables:
+                        writer.write_table(part_table.cast(ImmigrationTransforms.output_schema))
+            entries.append((f"s3://{self.output_s3_bucket}/{key}", upload.size))
         
+        self.log.info(f"Staged {len(entries)} part files for {self.cluster_slices} Redshift slices")
+        manifest_key = f"{self.output_s3_key}/{staged_name}.manifest"
+        s3_hook.load_string(string_data = StagedParts.manifest(entries),
+                            key         = manifest_key,
+                            bucket_name = self.output_s3_bucket,
+                            replace     = True)
+        return [manifest_key] + [url[len(f"s3://{self.output_s3_bucket}/"):] for url, _ in entries]
+
+    def upload_denormalized(self, s3_hook, staged_file, staged_name):
         
+        dimensions = SasLabels.load(self.labels_path, self.labels_cache_dir)
+        lookups    = {dimension: DimensionLookup(dimensions[dimension])
+                      for _, dimension in ImmigrationTransforms.dimension_columns.values()}
+        key        = f"{self.denormalized_s3_key}/{staged_name}.parquet"
+        with SpooledS3Upload(s3_hook, self.output_s3_bucket, key, self.spool_threshold) as denormalized_file:
+            with pq.ParquetWriter(denormalized_file, ImmigrationTransforms.denormalized_schema) as writer:
+                for batch in pq.ParquetFile(staged_file).iter_batches(batch_size=self.batch_size):
+                    writer.write_table(ImmigrationTransforms.denormalize(pa.Table.from_batches([batch]), lookups))
+        return key
 
+    def stage_in_parallel(self, fs, path_to_file, staged_file):
+        
+        with fs.open(path_to_file, 'rb') as raw_file:
+            row_groups = ImmigrationTransforms.valid_row_groups(pq.ParquetFile(raw_file))
+        assert len(row_groups)>0
+        pieces    = [piece.tolist() for piece in np.array_split(row_groups, min(self.workers, len(row_groups)))]
+        parts_dir = tempfile.mkdtemp(prefix='i94_parts_')
+        
+        try:
+            self.log.info(f"Transforming {len(row_groups)} row groups split into {len(pieces)} pieces")
+            with ProcessPoolExecutor(max_workers = len(pieces),
+                                     mp_context  = multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(ImmigrationTransforms.stage_row_groups, fs, path_to_file, piece,
+                                           os.path.join(parts_dir, f"part-{index:05d}.parquet"), self.engine)
+                           for index, piece in enumerate(pieces)]
+                results = [future.result() for future in futures]
+            
+            self.log.info("Ensuring correctness for the data level across pieces")
+            assert len({data_level for _, _, data_level in results if data_level is not None})==1
+            
+            self.log.info("Removing admnums duplicated across pieces, keeping their first occurrence")
+            admnums = np.concatenate([part_admnums for _, part_admnums, _ in results])
+            keep    = np.zeros(len(admnums), dtype=bool)
+            keep[np.unique(admnums, return_index=True)[1]] = True
             
+            offset = 0
+            with pq.ParquetWriter(staged_file, ImmigrationTransforms.output_schema) as writer:
+                for part_path, part_admnums, _ in results:
+                    part_keep = keep[offset:offset + len(part_admnums)]
+                    offset   += len(part_admnums)
+                    part      = pq.read_table(part_path)
+                    writer.write_table(part if part_keep.all() else part.filter(part_keep))
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
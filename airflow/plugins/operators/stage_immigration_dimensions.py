@@ -1,21 +1,26 @@
+from airflow.hooks.postgres_hook import PostgresHook
 from airflow.hooks.S3_hook import S3Hook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
 from airflow.contrib.hooks.aws_hook import AwsHook
-import pandas as pd
+from helpers import SasLabels, SqlQueries, RedshiftSession
 
 class StageImmigrationDimensionsOperator(BaseOperator):
         
     ''' 
-    Operator to stage the immigration dimensions. The mapping dictionaries representing these dimensions should be coded into /airflow/plugins/helpers/immigration_dimensions.py
+    Operator to stage the immigration dimensions. The mappings representing these dimensions are parsed from the SAS labels file at labels_path, such as /additional_resources/I94_SAS_Labels_Descriptions.SAS, at execution time, through the cached parser defined in /airflow/plugins/helpers/sas_labels.py
     
     - Inputs:
         * aws_credentials_id: AWS credentials passed from Airflow's UI
-        * dimensions: List mapping table names to the dimension mappings defined at/airflow/plugins/helpers/immigration_dimensions.py
+        * dimensions: List of the table names of the dimensions to be staged, as listed in SasLabels
         * output_s3_bucket: Bucket where the staging data will be stored
         * output_s3_key: Path to the staged output data within the selected bucket
+        * labels_path: Path to the SAS labels file on the worker
+        * labels_cache_dir: Directory where the parsed labels are cached, defaulting to a private directory under AIRFLOW_HOME
+        * redshift_conn_id: connection id defined from Airflow's UI. If defined, the SHA-256 hash of each staged CSV is compared with the one recorded in immigration.dimension_versions, and dimensions whose content is already loaded are not staged
         
-    - Outputs: CSV file representing the staging dimensions, copied into the selected path under the naming convention {table_name}.csv
+    - Outputs: CSV file representing the staging dimensions, serialized in memory and uploaded into the selected path under the naming convention {table_name}.csv.
+               The dimensions staged are pushed to XCom under the key "changed_dimensions", as a dict mapping each table name to its content hash, for CopyDimensionsOperator to load and record
     '''
     
     ui_color = '#358140'
@@ -26,30 +31,53 @@ class StageImmigrationDimensionsOperator(BaseOperator):
                  dimensions          = [],
                  output_s3_bucket    = "",
                  output_s3_key       = "",
+                 labels_path         = None,
+                 labels_cache_dir    = None,
+                 redshift_conn_id    = None,
                  *args, 
                  **kwargs):
 
         super(StageImmigrationDimensionsOperator, self).__init__(*args, **kwargs)
+        if not labels_path:
+            raise ValueError("The labels_path of the SAS labels file is required to stage the dimensions")
         self.aws_credentials_id  = aws_credentials_id
         self.dimensions          = dimensions
         self.output_s3_bucket    = output_s3_bucket
         self.output_s3_key       = output_s3_key
+        self.labels_path         = labels_path
+        self.labels_cache_dir    = labels_cache_dir
+        self.redshift_conn_id    = redshift_conn_id
 
     def execute(self, context):
         
         self.log.info("Initializing connections")
         s3_hook  = S3Hook (self.aws_credentials_id)
         
-        for dimension in self.dimensions:
+        self.log.info("Loading the dimensions from the SAS labels file")
+        dimensions = SasLabels.load(self.labels_path, self.labels_cache_dir)
+        
+        loaded_versions = {}
+        if self.redshift_conn_id:
+            self.log.info("Retrieving the content hashes of the loaded dimensions")
+            with RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id), max_connections=1) as redshift:
+                loaded_versions = dict(redshift.get_records(SqlQueries.dimension_versions))
+        
+        changed_dimensions = {}
+        for table_name in self.dimensions:
             
-            table_name = dimension['table_name']
-            records    = dimension['records']
+            records    = dimensions[table_name]
+            
+            csv_data     = SasLabels.to_csv(records)
+            content_hash = SasLabels.content_hash(records)
+            if loaded_versions.get(table_name)==content_hash:
+                self.log.info(f"The {table_name} table is already loaded with the same content, skipping staging")
+                continue
             
             self.log.info(f"Staging the {table_name} table")
-            pd.DataFrame([[x,y] for x,y in zip(records.keys(), records.values())],
-                         columns = ['code', 'name']).to_csv(f'{table_name}.csv', sep=';', index=False)
-            s3_hook.load_file(filename    = f'{table_name}.csv',
-                              key         = f'{self.output_s3_key}/{table_name}.csv',
-                              bucket_name = self.output_s3_bucket,
-                              replace     = True)
-            
\ No newline at end of file
+            s3_hook.load_string(string_data = csv_data,
+                                key         = f'{self.output_s3_key}/{table_name}.csv',
+                                bucket_name = self.output_s3_bucket,
+                                replace     = True)
+            changed_dimensions[table_name] = content_hash
+        
+        context['task_instance'].xcom_push(key='changed_dimensions', value=changed_dimensions)
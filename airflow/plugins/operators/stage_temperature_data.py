@@ -1,23 +1,39 @@
+from airflow.hooks.postgres_hook import PostgresHook
 from airflow.hooks.S3_hook import S3Hook
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from airflow.contrib.hooks.aws_hook import AwsHook
+import hashlib
+import json
+import pyarrow.parquet as pq
+import s3fs
+from helpers import (TemperatureTransforms, StagedParts, SpooledS3Upload, StagingCache, SqlQueries, RedshiftSession)
 
 
 class StageTemperatureDataOperator(BaseOperator):
-        
-    ''' 
-    Operator to stage the temperature data into the staging path selected.
-    
+
+    '''
+    Operator to clean and stage the temperature data into the staging path selected.
+
     - Inputs:
         * aws_credentials_id: AWS credentials passed from Airflow's UI
         * input_s3_bucket: Bucket containing the raw data to be staged
         * input_s3_key: Path to the raw data, which should contain the file "GlobalLandTemperaturesByCity.csv" applicable to the execution
         * output_s3_bucket: Bucket where the staging data will be stored
         * output_s3_key: Path to the staged output data
-        
-    - Outputs: CSV file representing the temperatures data, which will be stored under the name "cleanTemperatureData.csv"
+        * staging_mode: Either 'clean' or 'summary'. The clean mode stages the whole cleaned series, while the summary mode aggregates it per country in a single streaming pass and only stages the per-country statistics loaded into temperature.temp_stats
+        * block_size: Size in bytes of the CSV blocks parsed at once by the Arrow CSV reader, which caps the memory used by the raw data
+        * row_group_size: Number of rows buffered per country before they are written and uploaded as a parquet part file
+        * max_pending_rows: Maximum number of rows buffered across every country, beyond which the countries with the most buffered rows are written and uploaded early, which caps the memory used by the partitions
+        * use_cache: If True, staging is skipped when the raw object and the staging code are unchanged since the last run, based on a fingerprint manifest "{staged_name}.cache.json" stored next to the staged output
+        * spool_threshold: Maximum number of bytes of each staged partition held in memory before it spills to a private temporary file
+        * redshift_conn_id: connection id defined from Airflow's UI. If defined in the clean mode, the watermark recorded in temperature.load_watermarks is read and only the records dated after it are staged, as long as the count and checksum of the raw records up to the watermark still match the recorded ones. Otherwise the whole series is staged for a full reload. Nothing is staged when the fingerprint of the raw file and of the staging code matches the loaded one
+
+    - Outputs: In the clean mode, typed parquet files partitioned by country, stored under "cleanTemperatureData/country={country}-{hash}/part-{index}.parquet", where hash is a short hash of the raw country name, plus the COPY manifest "cleanTemperatureData.manifest" listing them.
+               In the summary mode, a single parquet file "temperatureStats/part-00000.parquet" with one row per country, plus the COPY manifest "temperatureStats.manifest".
+               When redshift_conn_id is defined in the clean mode, the load plan consumed by the incremental CopyDataOperator is pushed to XCom under the key "temperature_load"
     '''
-    
+
     ui_color = '#358140'
 
     @apply_defaults
@@ -27,7 +43,14 @@ class StageTemperatureDataOperator(BaseOperator):
                  input_s3_key        = "",
                  output_s3_bucket    = "",
                  output_s3_key       = "",
-                 *args, 
+                 staging_mode        = 'clean',
+                 block_size          = TemperatureTransforms.default_block_size,
+                 row_group_size      = 100000,
+                 max_pending_rows    = 1000000,
+                 use_cache           = True,
+                 spool_threshold     = SpooledS3Upload.default_spool_threshold,
+                 redshift_conn_id    = None,
+                 *args,
                  **kwargs):
 
         super(StageTemperatureDataOperator, self).__init__(*args, **kwargs)
@@ -36,22 +59,135 @@ class StageTemperatureDataOperator(BaseOperator):
         self.input_s3_key        = input_s3_key
         self.output_s3_bucket    = output_s3_bucket
         self.output_s3_key       = output_s3_key
+        self.staging_mode        = staging_mode
+        self.block_size          = block_size
+        self.row_group_size      = row_group_size
+        self.max_pending_rows    = max_pending_rows
+        self.use_cache           = use_cache
+        self.spool_threshold     = spool_threshold
+        self.redshift_conn_id    = redshift_conn_id
+        if staging_mode not in ('clean', 'summary'):
+            raise ValueError(f"Unknown staging mode {staging_mode}, expected 'clean' or 'summary'")
 
     def execute(self, context):
-        
+
         self.log.info("Initializing connections")
+        aws_hook = AwsHook(self.aws_credentials_id)
         s3_hook  = S3Hook (self.aws_credentials_id)
-        path_to_file = f"{self.input_s3_bucket}/{self.input_s3_key}/GlobalLandTemperaturesByCity.csv"
-        
-        try:
-            s3_hook.delete_objects(bucket = self.output_s3_bucket,
-                                   keys   = f"{self.output_s3_key}/cleanTemperatureData.csv")
-            self.log.info("File currently exists in staging area. Removing previous version")
-        except:
-            pass
-        
-        s3_hook.copy_object(source_bucket_key  = f"{self.input_s3_key}/GlobalLandTemperaturesByCity.csv",
-                            dest_bucket_key    = f"{self.output_s3_key}/cleanTemperatureData.csv",
-                            source_bucket_name = self.input_s3_bucket,
-                            dest_bucket_name   = self.output_s3_bucket)
-        
\ No newline at end of file
+        fs = s3fs.S3FileSystem(anon   = False,
+                               key    = aws_hook.get_credentials().access_key,
+                               secret = aws_hook.get_credentials().secret_key)
+        source_key   = f"{self.input_s3_key}/GlobalLandTemperaturesByCity.csv"
+        path_to_file = f"{self.input_s3_bucket}/{source_key}"
+
+        staged_name  = 'cleanTemperatureData' if self.staging_mode=='clean' else 'temperatureStats'
+        incremental  = self.staging_mode=='clean' and bool(self.redshift_conn_id)
+
+        if incremental:
+            self.log.info("Retrieving the watermark of the loaded temperatures")
+            with RedshiftSession(PostgresHook(postgres_conn_id=self.redshift_conn_id), max_connections=1) as redshift:
+                records = redshift.get_records(SqlQueries.temperature_watermark)
+            loaded             = records[0] if records and records[0][0] is not None else None
+            source_fingerprint = self.source_fingerprint(s3_hook, source_key)
+            if loaded is not None and loaded[3]==source_fingerprint:
+                self.log.info(f"Raw temperatures unchanged since they were loaded up to {loaded[0]}, nothing to stage")
+                context['task_instance'].xcom_push(key='temperature_load', value={'mode'              : 'current',
+                                                                                  'watermark'         : str(loaded[0]),
+                                                                                  'source_fingerprint': source_fingerprint})
+                return
+
+        if self.use_cache:
+            cache       = StagingCache(s3_hook, self.output_s3_bucket, f"{self.output_s3_key}/{staged_name}.cache.json")
+            fingerprint = cache.fingerprint(source_bucket = self.input_s3_bucket,
+                                            source_key    = source_key,
+                                            code_version  = StagingCache.code_version(TemperatureTransforms, StagedParts, SpooledS3Upload,
+                                                                                      StageTemperatureDataOperator),
+                                            parameters    = {'staging_mode'    : self.staging_mode,
+                                                             'row_group_size'  : self.row_group_size,
+                                                             'max_pending_rows': self.max_pending_rows,
+                                                             'loaded'          : [str(value) for value in loaded] if incremental and loaded else None})
+            if cache.is_fresh(fingerprint):
+                self.log.info("Raw data and staging code unchanged since the last run, skipping staging")
+                if incremental:
+                    context['task_instance'].xcom_push(key='temperature_load', value=cache.outputs())
+                return
+
+        plan = None
+        if incremental:
+            uploads, plan = self.stage_increment(s3_hook, fs, path_to_file, loaded, source_fingerprint)
+            context['task_instance'].xcom_push(key='temperature_load', value=plan)
+        else:
+            self.log.info(f"Streaming and cleaning the raw temperatures in blocks of {self.block_size} bytes: {path_to_file}")
+            with fs.open(path_to_file, 'rb') as raw_file:
+                tables = TemperatureTransforms.read_clean(raw_file, self.block_size)
+                if self.staging_mode=='clean':
+                    uploads = self.stage_partitions(s3_hook, tables)
+                else:
+                    uploads = self.stage_summary(s3_hook, tables)
+
+        manifest_key = f"{self.output_s3_key}/{staged_name}.manifest"
+        s3_hook.load_string(string_data = StagedParts.manifest([(f"s3://{self.output_s3_bucket}/{key}", upload.size)
+                                                                for key, upload in uploads.items()]),
+                            key         = manifest_key,
+                            bucket_name = self.output_s3_bucket,
+                            replace     = True)
+
+        if self.use_cache:
+            cache.record(fingerprint, [manifest_key] + list(uploads), outputs=plan)
+
+    def source_fingerprint(self, s3_hook, source_key):
+        ''' Hash of the ETag and size of the raw file and of the code cleaning it, identifying the series it stages '''
+        source = s3_hook.get_key(source_key, bucket_name=self.input_s3_bucket)
+        return hashlib.sha256(json.dumps([source.e_tag, source.content_length,
+                                          StagingCache.code_version(TemperatureTransforms, StagedParts, SpooledS3Upload)]).encode('utf-8')).hexdigest()
+
+    def stage_increment(self, s3_hook, fs, path_to_file, loaded, source_fingerprint):
+
+        watermark = loaded[0] if loaded is not None else None
+        history   = {}
+        self.log.info(f"Streaming the raw temperatures past the watermark {watermark} in blocks of {self.block_size} bytes: {path_to_file}")
+        with fs.open(path_to_file, 'rb') as raw_file:
+            uploads = self.stage_partitions(s3_hook, TemperatureTransforms.split_increment(
+                TemperatureTransforms.read_clean(raw_file, self.block_size), watermark, history))
+
+        mode = 'append' if watermark is not None else 'reload'
+        if watermark is not None and (history['history_rows'],
+                                      TemperatureTransforms.signed_checksum(history['history_checksum']))!=tuple(loaded[1:3]):
+            self.log.info(f"Raw records up to {watermark} no longer match the loaded ones, staging the whole series for a full reload")
+            mode = 'reload'
+            with fs.open(path_to_file, 'rb') as raw_file:
+                uploads = self.stage_partitions(s3_hook, TemperatureTransforms.split_increment(
+                    TemperatureTransforms.read_clean(raw_file, self.block_size), None, history))
+
+        return uploads, {'mode'              : mode,
+                         'watermark'         : str(watermark) if watermark is not None else None,
+                         'new_watermark'     : str(history['watermark']) if history['watermark'] is not None else None,
+                         'history_rows'      : history['rows'],
+                         'history_checksum'  : TemperatureTransforms.signed_checksum(history['checksum']),
+                         'source_fingerprint': source_fingerprint,
+                         'staged_rows'       : history['rows'] - history['history_rows'] if mode=='append' else history['rows']}
+
+    def stage_partitions(self, s3_hook, tables):
+
+        uploads = {}
+
+        def open_part(country, index):
+            key = f"{self.output_s3_key}/cleanTemperatureData/country={TemperatureTransforms.partition_name(country)}/part-{index:05d}.parquet"
+            uploads[key] = SpooledS3Upload(s3_hook, self.output_s3_bucket, key, self.spool_threshold)
+            return uploads[key]
+
+        rows = TemperatureTransforms.write_partitions(tables, open_part,
+                                                      row_group_size   = self.row_group_size,
+                                                      max_pending_rows = self.max_pending_rows)
+        self.log.info(f"Uploaded {sum(rows.values())} cleaned records partitioned into {len(rows)} countries and {len(uploads)} part files")
+        return uploads
+
+    def stage_summary(self, s3_hook, tables):
+
+        key    = f"{self.output_s3_key}/temperatureStats/part-00000.parquet"
+        upload = SpooledS3Upload(s3_hook, self.output_s3_bucket, key, self.spool_threshold)
+        stats  = TemperatureTransforms.summarize(tables)
+        self.log.info(f"Uploading the temperature statistics of {stats.num_rows} countries")
+        with upload as stats_file:
+            pq.write_table(stats, stats_file, compression=TemperatureTransforms.compression)
+        return {key: upload}
@@ -0,0 +1,82 @@
+import io
+
+import numpy as np
+import pytest
+
+from helpers.admnum_index import AdmnumIndex
+
+
+class FakeS3Hook:
+
+    ''' In-memory stand-in for the S3Hook methods used by the index, recording every key read '''
+
+    def __init__(self):
+        self.files = {}
+        self.reads = []
+
+    def list_keys(self, bucket_name, prefix):
+        return [key for key in self.files if key.startswith(prefix)]
+
+    def check_for_key(self, key, bucket_name):
+        return key in self.files
+
+    def get_key(self, key, bucket_name):
+        self.reads.append(key)
+        body = self.files[key]
+        return type('S3Object', (), {'get': lambda self: {'Body': io.BytesIO(body)}})()
+
+    def load_file_obj(self, file_obj, key, bucket_name, replace):
+        self.files[key] = file_obj.read()
+
+
+@pytest.fixture
+def months():
+    rng = np.random.default_rng(0)
+    return {f"2016-{month:02d}": rng.choice(10**9, 20000, replace=False) for month in range(1, 4)}
+
+
+def indexed(months, use_bloom):
+    index = AdmnumIndex(FakeS3Hook(), 'bucket', 'index', use_bloom=use_bloom, chunk_size=3000)
+    for month_name, admnums in months.items():
+        index.save_month(month_name, admnums)
+    return index
+
+
+@pytest.mark.parametrize('use_bloom', [False, True])
+def test_loaded_mask_matches_exact_membership(months, use_bloom):
+    rng     = np.random.default_rng(1)
+    index   = indexed(months, use_bloom)
+    admnums = np.concatenate([months['2016-01'][:500], months['2016-03'][:500], rng.choice(10**9, 5000)])
+
+    expected = np.isin(admnums, months['2016-01']) | np.isin(admnums, months['2016-02'])
+    assert (index.loaded_mask(admnums, exclude_month='2016-03')==expected).all()
+    assert index.months()==sorted(months)
+
+
+def test_loaded_mask_reads_each_month_at_most_once(months):
+    index = indexed(months, use_bloom=True)
+
+    index.loaded_mask(np.concatenate([months['2016-01'][:100], months['2016-02'][:100]]))
+
+    assert len(index.s3_hook.reads)==len(set(index.s3_hook.reads))
+
+
+def test_bloom_filter_skips_month_downloads_on_misses(months):
+    index = indexed(months, use_bloom=True)
+
+    assert not index.loaded_mask(np.array([-1, -2, -3])).any()
+    assert all(key.endswith('.bloom') for key in index.s3_hook.reads)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    index   = AdmnumIndex(FakeS3Hook(), 'bucket', 'index', chunk_size=1000)
+    admnums = np.random.default_rng(2).choice(10**12, 10000, replace=False)
+
+    assert index.bloom_hits(index.bloom_filter(admnums), admnums).all()
+
+
+def test_months_without_bloom_filter_are_checked_exactly(months):
+    index = indexed(months, use_bloom=True)
+    del index.s3_hook.files[index.bloom_key('2016-02')]
+
+    assert index.loaded_mask(months['2016-02'][:10]).all()
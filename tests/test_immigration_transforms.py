@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from helpers.immigration_transforms import ImmigrationTransforms
+
+
+def raw_month(rows=2000, seed=0):
+    ''' Raw i94 month with zero and duplicated admnums, negative ages, invalid genders and missing departures '''
+    rng     = np.random.default_rng(seed)
+    arrdate = rng.integers(20454, 20485, rows).astype(float)
+    depdate = arrdate + rng.integers(0, 120, rows)
+    depdate[rng.random(rows) < 0.1] = np.nan
+    admnum  = rng.integers(1, rows // 2, rows).astype(float)
+    admnum[rng.random(rows) < 0.05] = 0
+    i94bir  = rng.integers(-2, 95, rows).astype(float)
+    i94bir[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({'i94yr'  : np.full(rows, 2016.0),
+                         'i94mon' : np.full(rows, 1.0),
+                         'i94cit' : rng.choice([101.0, 209.0, 582.0, np.nan], rows),
+                         'i94res' : rng.choice([101.0, 209.0, 582.0, np.nan], rows),
+                         'i94visa': rng.choice([1.0, 2.0, 3.0], rows),
+                         'i94mode': rng.choice([1.0, 2.0, 3.0, 9.0, np.nan], rows),
+                         'i94addr': rng.choice(['MA', 'NY', 'CA', None], rows),
+                         'i94bir' : i94bir,
+                         'gender' : rng.choice(['M', 'F', 'X', 'U', 'Z', None], rows),
+                         'arrdate': arrdate,
+                         'depdate': depdate,
+                         'admnum' : admnum})
+
+
+def decoded(table):
+    ''' Table with dictionary-encoded columns cast back to their values, since both engines may order dictionaries differently '''
+    columns = [column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column for column in table.columns]
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+def pandas_engine(data):
+    return pa.Table.from_pandas(ImmigrationTransforms.stage(data.copy()),
+                                schema         = ImmigrationTransforms.output_schema,
+                                preserve_index = False)
+
+
+def test_stage_cleans_records():
+    data   = raw_month()
+    staged = ImmigrationTransforms.stage(data.copy())
+
+    assert staged.columns.tolist()==ImmigrationTransforms.output_columns
+    assert staged.admnum.is_unique and (staged.admnum!=0).all()
+    assert len(staged)==data.admnum[data.admnum!=0].nunique()
+    assert set(staged.gender.dropna())<=set(ImmigrationTransforms.valid_genders)
+    assert (staged.departure_day==ImmigrationTransforms.na_value).sum()>0
+    assert (staged.arrival_month==1).all() and (staged.arrival_year==2016).all()
+
+
+def test_engines_produce_the_same_table():
+    data  = raw_month()
+    arrow = ImmigrationTransforms.stage_arrow(pa.Table.from_pandas(data, preserve_index=False))
+
+    assert arrow.schema==ImmigrationTransforms.output_schema
+    assert decoded(arrow).equals(decoded(pandas_engine(data)))
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'arrow'])
+def test_stage_batches_matches_in_memory_staging(engine):
+    data    = raw_month()
+    batches = pa.Table.from_pandas(data, preserve_index=False).to_batches(max_chunksize=300)
+
+    streamed = pa.concat_tables(ImmigrationTransforms.stage_batches(batches, engine))
+
+    assert decoded(streamed).equals(decoded(pandas_engine(data)))
+
+
+def test_stage_arrow_drops_seen_admnums():
+    data   = raw_month()
+    seen   = np.unique(data.admnum[data.admnum!=0].astype(np.int64).to_numpy()[:50])
+    staged = ImmigrationTransforms.stage_arrow(pa.Table.from_pandas(data, preserve_index=False), seen)
+
+    assert not np.isin(staged['admnum'].to_numpy(), seen).any()
+    assert staged.num_rows==data.admnum[data.admnum!=0].nunique() - len(seen)
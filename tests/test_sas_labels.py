@@ -0,0 +1,71 @@
+import os
+import stat
+
+import pytest
+
+from helpers.sas_labels import SasLabels
+
+
+labels_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'additional_resources', 'I94_SAS_Labels_Descriptions.SAS')
+
+snippet = """
+/* I94VISA - Visa codes collapsed into three categories:
+   1 = Business
+   2 = Pleasure
+*/
+  value i94cntyl
+   582 =  'MEXICO Air Sea, and Not Reported (I-94, no land arrivals)'
+   236 =  'AFGHANISTAN'
+;
+  value $i94prtl
+   'ALC'\t=\t'ALCAN, AK'
+   'INT'\t=\t'INT''L FALLS,    MN'
+;
+value i94model
+\t1 = 'Air'
+\t9 = 'Not reported' ;
+/* I94ADDR - everything else goes into 'other' */
+value i94addrl
+\t'AL'='ALABAMA'
+\t'99'='All Other Codes' ;
+"""
+
+
+def test_parse_reads_codes_and_names():
+    dimensions = SasLabels.parse(snippet)
+
+    assert dimensions=={'trip_reason_codes'  : {1: 'Business', 2: 'Pleasure'},
+                        'country_codes'      : {582: 'MEXICO Air Sea, and Not Reported (I-94, no land arrivals)', 236: 'AFGHANISTAN'},
+                        'port_codes'         : {'ALC': 'ALCAN, AK', 'INT': "INT'L FALLS, MN"},
+                        'entry_channel_codes': {1: 'Air', 9: 'Not reported'},
+                        'state_codes'        : {'AL': 'ALABAMA', '99': 'All Other Codes'}}
+
+
+def test_parse_fails_on_missing_dimensions():
+    with pytest.raises(ValueError, match='state_codes'):
+        SasLabels.parse(snippet.split('value i94addrl')[0])
+
+
+def test_parse_reads_the_labels_file():
+    with open(labels_path, encoding='latin-1') as labels_file:
+        dimensions = SasLabels.parse(labels_file.read())
+
+    assert {table_name: len(records) for table_name, records in dimensions.items()}=={'trip_reason_codes'  : 3,
+                                                                                    'country_codes'      : 289,
+                                                                                    'port_codes'         : 660,
+                                                                                    'entry_channel_codes': 4,
+                                                                                    'state_codes'        : 55}
+    assert dimensions['trip_reason_codes']=={1: 'Business', 2: 'Pleasure', 3: 'Student'}
+    assert dimensions['port_codes']['INT'].startswith("INT'L FALLS, MN")
+
+
+def test_load_caches_the_parsed_labels_in_a_private_directory(tmp_path):
+    cache_dir = str(tmp_path / 'sas_labels')
+
+    parsed = SasLabels.load(labels_path, cache_dir)
+    cached = SasLabels.load(labels_path, cache_dir)
+
+    assert cached==parsed
+    assert all(type(code) is type(next(iter(parsed[table_name]))) for table_name in cached for code in cached[table_name])
+    assert len(os.listdir(cache_dir))==1
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode)==0o700
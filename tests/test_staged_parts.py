@@ -0,0 +1,33 @@
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from helpers.staged_parts import StagedParts
+
+
+def staged_file(rows):
+    buffer = io.BytesIO()
+    pq.write_table(pa.table({'admnum': list(range(rows))}), buffer, row_group_size=7)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize('rows, parts', [(100, 8), (100, 3), (5, 8), (64, 1)])
+def test_iter_parts_splits_rows_evenly_and_in_order(rows, parts):
+    tables = [pa.concat_tables(part) for part in StagedParts.iter_parts(staged_file(rows), parts, batch_size=10)]
+
+    sizes = [table.num_rows for table in tables]
+    assert len(tables)==min(parts, rows)
+    assert sum(sizes)==rows and max(sizes) - min(sizes)<=1
+    assert pa.concat_tables(tables)['admnum'].to_pylist()==list(range(rows))
+
+
+def test_manifest_lists_every_part_as_mandatory():
+    manifest = json.loads(StagedParts.manifest([('s3://bucket/part-00000.parquet', 120),
+                                                ('s3://bucket/part-00001.parquet', 80)]))
+
+    assert manifest=={'entries': [{'url': 's3://bucket/part-00000.parquet', 'mandatory': True, 'meta': {'content_length': 120}},
+                                  {'url': 's3://bucket/part-00001.parquet', 'mandatory': True, 'meta': {'content_length': 80}}]}
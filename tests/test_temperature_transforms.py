@@ -0,0 +1,118 @@
+import contextlib
+import datetime
+import io
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from helpers.temperature_transforms import TemperatureTransforms
+
+
+def cleaned(countries, start=datetime.date(2000, 1, 1)):
+    rows = len(countries)
+    return pa.Table.from_pydict({'dt'                           : [start + datetime.timedelta(days=31 * i) for i in range(rows)],
+                                 'averagetemperature'           : [float(i) for i in range(rows)],
+                                 'averagetemperatureuncertainty': [0.5] * rows,
+                                 'city'                         : [f"city_{i % 3}" for i in range(rows)],
+                                 'country'                      : countries,
+                                 'latitude'                     : [57.05] * rows,
+                                 'longitude'                    : [-10.33] * rows},
+                                schema=TemperatureTransforms.output_schema)
+
+
+class Parts:
+
+    ''' In-memory stand-in for the staged part files, tracking how many are open at once '''
+
+    def __init__(self):
+        self.files    = {}
+        self.open     = 0
+        self.max_open = 0
+
+    @contextlib.contextmanager
+    def __call__(self, country, index):
+        buffer = io.BytesIO()
+        self.open    += 1
+        self.max_open = max(self.max_open, self.open)
+        yield buffer
+        self.open -= 1
+        self.files[(country, index)] = pq.read_table(io.BytesIO(buffer.getvalue()))
+
+
+def test_split_by_country_groups_null_countries():
+    groups = dict(TemperatureTransforms.split_by_country(pa.table({'country': ['A', None, 'B', None]})))
+
+    assert sorted(groups, key=str)==['A', 'B', None]
+    assert groups[None].num_rows==2
+    assert TemperatureTransforms.partition_name(None)=='unknown'
+
+
+def test_partition_names_never_collide():
+    assert TemperatureTransforms.partition_name("Cote d'Ivoire")!=TemperatureTransforms.partition_name('Cote d Ivoire')
+    assert TemperatureTransforms.partition_name('Denmark').startswith('Denmark-')
+
+
+def test_write_partitions_caps_pending_rows():
+    tables = [cleaned(['A', 'B', 'C', None] * 25) for _ in range(4)]
+    parts  = Parts()
+
+    rows = TemperatureTransforms.write_partitions(iter(tables), parts, row_group_size=1000, max_pending_rows=120)
+
+    assert rows=={'A': 100, 'B': 100, 'C': 100, None: 100}
+    assert parts.max_open==1
+    assert len(parts.files) > 4
+    for country in rows:
+        written = [table for (part_country, _), table in parts.files.items() if part_country==country]
+        assert sum(table.num_rows for table in written)==100
+        assert all(table.schema.equals(TemperatureTransforms.output_schema) for table in written)
+
+
+def test_read_clean_parses_coordinates_and_drops_missing_temperatures():
+    raw = (b"dt,AverageTemperature,AverageTemperatureUncertainty,City,Country,Latitude,Longitude\n"
+           b"1743-11-01,6.068,1.737,\xc3\x81rhus,Denmark,57.05N,10.33E\n"
+           b"1743-12-01,,,\xc3\x81rhus,Denmark,57.05N,10.33E\n"
+           b"1744-04-01,5.788,3.624,Lima,Peru,12.05S,77.26W\n")
+
+    table = pa.concat_tables(TemperatureTransforms.read_clean(io.BytesIO(raw), block_size=100))
+
+    assert table.schema.equals(TemperatureTransforms.output_schema)
+    assert table['city'].to_pylist()==['\u00c1rhus', 'Lima']
+    assert table['latitude'].to_pylist()==[57.05, -12.05]
+    assert table['longitude'].to_pylist()==[10.33, -77.26]
+
+
+def test_split_increment_keeps_rows_after_the_watermark():
+    tables    = [cleaned(['A'] * 10), cleaned(['B'] * 10, start=datetime.date(2001, 1, 1))]
+    watermark = datetime.date(2000, 6, 30)
+    history   = {}
+
+    increment = pa.concat_tables(TemperatureTransforms.split_increment(iter(tables), watermark, history))
+
+    assert increment.num_rows==14 and pc.min(increment['dt']).as_py() > watermark
+    assert history['history_rows']==6 and history['rows']==20
+    assert history['watermark']==max(table['dt'].to_pylist()[-1] for table in tables)
+    full_history = {}
+    list(TemperatureTransforms.split_increment(iter(tables), None, full_history))
+    assert full_history['checksum']==history['checksum']
+    assert full_history['history_rows']==0
+
+
+def test_summarize_matches_numpy_statistics():
+    tables = [cleaned(['A', 'B', 'A'] * 7), cleaned(['B', 'C'] * 5, start=datetime.date(2010, 1, 1))]
+    data   = pa.concat_tables(tables).to_pandas()
+
+    stats = TemperatureTransforms.summarize(iter(tables)).to_pandas().set_index('country')
+
+    assert stats.index.tolist()==['A', 'B', 'C']
+    for country, group in data.groupby('country'):
+        temperatures = group.averagetemperature.to_numpy()
+        assert stats.loc[country, 'n']==len(temperatures)
+        assert np.isclose(stats.loc[country, 'mean'], temperatures.mean())
+        assert np.isclose(stats.loc[country, 'm2'], ((temperatures - temperatures.mean())**2).sum())
+        assert stats.loc[country, 'watermark']==group.dt.max()
+
+
+def test_summarize_of_no_tables_is_empty():
+    assert TemperatureTransforms.summarize(iter([])).equals(TemperatureTransforms.stats_schema.empty_table())